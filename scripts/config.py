@@ -12,7 +12,44 @@ RUN_MODE = os.getenv("RUN_MODE", "PRODUCTION") # Options: PRODUCTION, BENCHMARK,
 
 # Model Configuration
 OPENROUTER_MODEL = "openai/gpt-5.2" 
-GEMINI_MODEL = "gemini-3-pro-preview" 
+GEMINI_SUMMARY_MODEL = "gemini-3-pro-preview" 
+GEMINI_EXTRACT_MODEL = "gemini-2.5-flash" # Ground-truth extraction (numbers only)
+
+# API Retry Policy (exponential backoff with full jitter)
+API_MAX_ATTEMPTS = 6
+API_BACKOFF_BASE = 1.0 # seconds
+API_BACKOFF_CAP = 60.0 # seconds
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# HTTP Timeouts (seconds) so a stalled connection can't hang the scheduled job
+DOWNLOAD_TIMEOUT = (10, 60) # (connect, read between chunks)
+OPENROUTER_TIMEOUT = (10, 300) # reasoning models can think for minutes before the first byte
+GEMINI_REQUEST_TIMEOUT = 600 # per generate_content call
+
+# Vision Rendering (page images sent to OpenRouter)
+VISION_JPEG_QUALITY = 75 # PyMuPDF default is 95
+# 2x zoom (~144 DPI) already matches the ~1.5k px long edge vision models downscale to.
+# Tunable per run (e.g. VISION_ZOOM=1.5) to trade legibility for payload size.
+VISION_ZOOM = float(os.getenv("VISION_ZOOM", "2"))
+# Guard for oversized pages (tabloid, posters). Letter/A4 at 2x (1584/1684px) pass through at full zoom;
+# it also bounds VISION_ZOOM, e.g. letter pages stop growing past ~2.6x.
+VISION_MAX_EDGE_PX = 2048
+# Source -> (max pages, zoom, grayscale), in the order images are sent.
+VISION_RENDER = {
+    "wisdomtree": (25, VISION_ZOOM, False), # First 25 pages (skipping glossary/legal); charts need color
+    "cme_sec01": (1, VISION_ZOOM, True), # CME: summary page only, black-and-white number tables
+    "cme_sec09": (1, VISION_ZOOM, True),
+    "cme_sec11": (1, VISION_ZOOM, True),
+}
+
+# LLM Response Cache (same-day reruns skip repeat summary calls)
+LLM_CACHE_DIR = ".llm_cache"
+LLM_CACHE_TTL_HOURS = 12
+GEMINI_UPLOAD_INDEX = os.path.join(LLM_CACHE_DIR, "gemini_uploads.json") # PDF sha256 -> live Gemini file
+REPORT_STATE_FILE = os.path.join(LLM_CACHE_DIR, "last_report.json") # Fingerprint of the last published report + whether it was emailed
+PDF_VALIDATORS_FILE = os.path.join(LLM_CACHE_DIR, "pdf_validators.json") # Source URL -> ETag/Last-Modified of the local copy
+LIVE_DATA_CACHE_DIR = os.path.join(LLM_CACHE_DIR, "yfinance") # Same-day Yahoo history, keyed by ticker/period/date
+LIVE_DATA_CACHE_TTL_MINUTES = 30 # Intraday bars move; keep reruns reasonably fresh
 
 # Data Sources
 PDF_SOURCES = {
@@ -1,32 +1,70 @@
 import os
 import requests
-import fitz  # PyMuPDF
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import smtplib
-import google.generativeai as genai
+import ssl
 import base64
-import json
+import functools
+import hashlib
+import orjson
 import re
 import math
-import yfinance as yf
+import random
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
 import time 
 from event_flags import get_event_context
 
 from config import (
     OPENROUTER_API_KEY, AI_STUDIO_API_KEY, SMTP_EMAIL, SMTP_PASSWORD, RECIPIENT_EMAIL,
-    SUMMARIZE_PROVIDER, GITHUB_REPOSITORY, PDF_SOURCES, OPENROUTER_MODEL, GEMINI_MODEL,
-    RUN_MODE, BENCHMARK_MODELS, NOISE_THRESHOLDS
+    SUMMARIZE_PROVIDER, GITHUB_REPOSITORY, PDF_SOURCES, OPENROUTER_MODEL, GEMINI_SUMMARY_MODEL, GEMINI_EXTRACT_MODEL,
+    RUN_MODE, BENCHMARK_MODELS, NOISE_THRESHOLDS,
+    API_MAX_ATTEMPTS, API_BACKOFF_BASE, API_BACKOFF_CAP, RETRYABLE_STATUS_CODES,
+    DOWNLOAD_TIMEOUT, OPENROUTER_TIMEOUT, GEMINI_REQUEST_TIMEOUT,
+    VISION_JPEG_QUALITY, VISION_RENDER, VISION_MAX_EDGE_PX, LLM_CACHE_DIR, LLM_CACHE_TTL_HOURS, GEMINI_UPLOAD_INDEX, REPORT_STATE_FILE, PDF_VALIDATORS_FILE,
+    LIVE_DATA_CACHE_DIR, LIVE_DATA_CACHE_TTL_MINUTES
 )
 from prompts import (
     EXTRACTION_PROMPT, EXTRACTION_PROMPT_SEC09, EXTRACTION_PROMPT_SEC11,
-    BENCHMARK_DATA_SYSTEM_PROMPT, BENCHMARK_SYSTEM_PROMPT, SUMMARY_SYSTEM_PROMPT
+    BENCHMARK_DATA_SYSTEM_PROMPT, BENCHMARK_SYSTEM_PROMPT, SUMMARY_SYSTEM_PROMPT,
+    PROMPT_DATA_MARKER
 )
 from report_renderer import generate_html, generate_benchmark_html
 
 # --- Helpers ---
 
+# Leading/trailing Markdown code fences that LLMs wrap around their output
+FENCE_PATTERN = re.compile(r"\A\s*```(?:markdown|json)?[ \t]*\n?|\n?[ \t]*```\s*\Z", re.IGNORECASE)
+
+# Report section headings (with their [SECTION:X] sentinels) -> TOC anchor inserted above them
+TOC_ANCHOR_PATTERNS = [
+    (re.compile(r"(?i)(### 1\. The Dashboard.*SECTION:DASHBOARD\])"), r'<a id="scoreboard"></a>\n\1'),
+    (re.compile(r"(?i)(### 2\. Executive Takeaway.*SECTION:SUMMARY\])"), r'<a id="takeaway"></a>\n\1'),
+    (re.compile(r"(?i)(### 3\. The .*Fiscal.*SECTION:FISCAL\])"), r'<a id="fiscal"></a>\n\1'),
+    (re.compile(r"(?i)(### 4\. Rates.*SECTION:RATES\])"), r'<a id="rates"></a>\n\1'),
+    (re.compile(r"(?i)(### 5\. The .*Canary.*SECTION:CREDIT\])"), r'<a id="credit"></a>\n\1'),
+    (re.compile(r"(?i)(### 6\. The .*Engine.*SECTION:EQUITIES\])"), r'<a id="engine"></a>\n\1'),
+    (re.compile(r"(?i)(### 7\. Valuation.*SECTION:VALUATION\])"), r'<a id="valuation"></a>\n\1'),
+    (re.compile(r"(?i)(### 8\. Conclusion.*SECTION:CONCLUSION\])"), r'<a id="conclusion"></a>\n\1'),
+]
+SENTINEL_PATTERN = re.compile(r"\s*\[SECTION:[A-Z]+\]")
+
+# Pretty-printed JSON for logs and the audit email (orjson, numpy-safe)
+JSON_PRETTY_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def dumps_pretty(obj):
+    return orjson.dumps(obj, option=JSON_PRETTY_OPTIONS).decode()
+
+# Canonical JSON for prompt data: sorted keys, no whitespace, so identical inputs give identical bytes
+JSON_CANONICAL_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def dumps_canonical(obj):
+    return orjson.dumps(obj, option=JSON_CANONICAL_OPTIONS).decode()
+
 def parse_int_token(tok):
     if not tok: return None
     # Remove commas AND spaces (LLM sometimes outputs "+ 123")
@@ -40,51 +78,289 @@ def parse_int_token(tok):
     except:
         return None
 
-def pdf_to_images(pdf_path):
-    print(f"Converting {pdf_path} to images for Vision...")
+# --- HTTP Session ---
+
+# One pooled keep-alive session for PDF downloads and OpenRouter, so repeat hosts skip the TCP/TLS handshake.
+# Adapter retries cover idempotent GETs only; POSTs go through post_with_retry.
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10, pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=sorted(RETRYABLE_STATUS_CODES))
+))
+
+# --- API Retry Helpers ---
+
+@functools.lru_cache(maxsize=1)
+def get_genai():
+    # Deferred import: google.generativeai pulls in protobuf/gRPC, which OpenRouter-only runs and
+    # the spawned page-render workers never need. Configured once on first use.
+    import google.generativeai as genai
+    genai.configure(api_key=AI_STUDIO_API_KEY)
+    return genai
+
+def gemini_transient_errors():
+    from google.api_core import exceptions as google_exceptions
+    return (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.DeadlineExceeded,
+    )
+
+def backoff_delay(attempt, retry_after=None):
+    # Honor server-provided Retry-After (seconds) when present, else full-jitter exponential backoff
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), API_BACKOFF_CAP)
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(API_BACKOFF_CAP, API_BACKOFF_BASE * (2 ** attempt)))
+
+def post_with_retry(url, **kwargs):
+    for attempt in range(API_MAX_ATTEMPTS):
+        is_last = attempt == API_MAX_ATTEMPTS - 1
+        try:
+            response = SESSION.post(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if is_last: raise
+            delay = backoff_delay(attempt)
+            print(f"Transient network error ({e}). Retrying in {delay:.1f}s (attempt {attempt + 1}/{API_MAX_ATTEMPTS})...")
+            time.sleep(delay)
+            continue
+
+        if response.status_code not in RETRYABLE_STATUS_CODES or is_last:
+            return response
+        delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+        print(f"HTTP {response.status_code} from {url}. Retrying in {delay:.1f}s (attempt {attempt + 1}/{API_MAX_ATTEMPTS})...")
+        time.sleep(delay)
+
+def generate_with_retry(model, content):
+    transient_errors = gemini_transient_errors()
+    for attempt in range(API_MAX_ATTEMPTS):
+        try:
+            return model.generate_content(content, request_options={"timeout": GEMINI_REQUEST_TIMEOUT})
+        except transient_errors as e:
+            if attempt == API_MAX_ATTEMPTS - 1: raise
+            delay = backoff_delay(attempt)
+            print(f"Gemini transient error ({type(e).__name__}). Retrying in {delay:.1f}s (attempt {attempt + 1}/{API_MAX_ATTEMPTS})...")
+            time.sleep(delay)
+
+# --- LLM Response Cache ---
+# Same-day retries (CI flake, email failure) reuse the summary instead of paying for another call
+
+def llm_cache_key(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def llm_cache_get(key):
+    path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > LLM_CACHE_TTL_HOURS * 3600:
+            return None
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())["text"]
+    except Exception:
+        return None
+
+def llm_cache_put(key, model, text):
+    try:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(LLM_CACHE_DIR, f"{key}.json"), "wb") as f:
+            f.write(orjson.dumps({"model": model, "text": text}))
+    except Exception as e:
+        print(f"Warning: Could not write LLM cache: {e}")
+
+def prune_cache():
+    # Expired entries are never read again; delete them so the cache CI restores and re-saves each run stays bounded
+    now = time.time()
+    keep = {os.path.basename(p) for p in (GEMINI_UPLOAD_INDEX, REPORT_STATE_FILE, PDF_VALIDATORS_FILE)}
+    for directory, suffix, ttl in (
+        (LLM_CACHE_DIR, ".json", LLM_CACHE_TTL_HOURS * 3600),
+        (LIVE_DATA_CACHE_DIR, ".pkl", LIVE_DATA_CACHE_TTL_MINUTES * 60),
+    ):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.name.endswith(suffix) or entry.name in keep or not entry.is_file():
+                continue
+            try:
+                if now - entry.stat().st_mtime > ttl:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+    # load_upload_index already drops Gemini files past their expiry
+    if os.path.exists(GEMINI_UPLOAD_INDEX):
+        save_upload_index(load_upload_index())
+
+def render_pages(pdf_path, page_numbers, zoom=2, grayscale=False):
+    # Worker: each process opens its own document (MuPDF is not safe to share across threads)
+    import fitz  # PyMuPDF
     doc = fitz.open(pdf_path)
+    colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+    matrix = fitz.Matrix(zoom, zoom)
     images = []
-    # Production: Limit to first 25 pages (skipping glossary/legal)
-    for page_num in range(min(len(doc), 25)): 
-        page = doc.load_page(page_num)
-        pix = page.get_pixmap(matrix=fitz.Matrix(3, 3)) # 3x zoom for maximum clarity
-        img_data = pix.tobytes("jpeg")
-        base64_img = base64.b64encode(img_data).decode('utf-8')
-        images.append(base64_img)
-    print(f"Converted {len(images)} pages to images.")
+    # page_numbers is a contiguous range; doc.pages() walks the page tree once instead of per load_page()
+    for page in doc.pages(page_numbers.start, page_numbers.stop):
+        # Blank divider pages carry nothing for vision; text is checked first so content pages short-circuit
+        if not page.get_text().strip() and not page.get_images() and not page.get_drawings():
+            continue
+        # Cap the long edge of oversized pages; letter/A4 at the default zoom keep the shared matrix
+        scale = min(zoom, VISION_MAX_EDGE_PX / max(page.rect.width, page.rect.height))
+        page_matrix = matrix if scale == zoom else fitz.Matrix(scale, scale)
+        pix = page.get_pixmap(matrix=page_matrix, colorspace=colorspace, alpha=False)
+        images.append(pix.tobytes("jpeg", jpg_quality=VISION_JPEG_QUALITY)) # raw JPEG bytes; base64 happens at the call site
+    doc.close()
     return images
 
+def pdf_to_images(pdf_path, max_pages=25, zoom=2, grayscale=False):
+    # Memoized on the file's mtime so a re-downloaded PDF is re-rendered
+    return list(render_pdf_cached(pdf_path, os.path.getmtime(pdf_path), max_pages, zoom, grayscale))
+
+@functools.lru_cache(maxsize=8)
+def render_pdf_cached(pdf_path, mtime, max_pages, zoom, grayscale):
+    import fitz  # PyMuPDF
+    print(f"Converting {pdf_path} to images for Vision...")
+    with fitz.open(pdf_path) as doc:
+        # Production: Limit to first 25 pages (skipping glossary/legal)
+        page_count = min(len(doc), max_pages)
+
+    # Split pages into contiguous chunks, one per worker process, so output stays in page order
+    workers = min(os.cpu_count() or 1, page_count)
+    if workers <= 1:
+        images = render_pages(pdf_path, range(page_count), zoom, grayscale)
+    else:
+        chunk = math.ceil(page_count / workers)
+        chunks = [range(i, min(i + chunk, page_count)) for i in range(0, page_count, chunk)]
+        images = []
+        # spawn: forking while gRPC/HTTP threads are live can deadlock the child
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=multiprocessing.get_context("spawn")) as executor:
+            n = len(chunks)
+            for part in executor.map(render_pages, [pdf_path] * n, chunks, [zoom] * n, [grayscale] * n):
+                images.extend(part)
+    print(f"Converted {len(images)} pages to images.")
+    return tuple(images)
+
+def load_pdf_validators():
+    try:
+        with open(PDF_VALIDATORS_FILE, "rb") as f:
+            return orjson.loads(f.read())
+    except Exception:
+        return {}
+
+def save_pdf_validators(validators):
+    try:
+        os.makedirs(os.path.dirname(PDF_VALIDATORS_FILE), exist_ok=True)
+        with open(PDF_VALIDATORS_FILE, "wb") as f:
+            f.write(orjson.dumps(validators))
+    except Exception as e:
+        print(f"Warning: Could not save PDF validators: {e}")
+
+def download_pdf(name, url, validators=None):
+    print(f"Downloading {name} from {url}...")
+    try:
+        filename = f"{name}.pdf"
+        # Conditional GET: if the local copy is still current the server answers 304 with no body
+        headers = {}
+        known = validators.get(url) if validators and os.path.exists(filename) else None
+        if known:
+            if known.get("etag"): headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"): headers["If-Modified-Since"] = known["last_modified"]
+        # Stream to a temp file so memory stays at chunk size and a failed download never leaves a partial PDF
+        with SESSION.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers) as response:
+            if response.status_code == 304:
+                print(f"{filename} unchanged on server. Using local copy.")
+                return filename
+            response.raise_for_status()
+            with open(f"{filename}.part", "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        os.replace(f"{filename}.part", filename)
+        if validators is not None:
+            if etag or last_modified:
+                validators[url] = {"etag": etag, "last_modified": last_modified}
+            else:
+                validators.pop(url, None)
+        print(f"Downloaded {filename}.")
+        return filename
+    except Exception as e:
+        print(f"Error downloading {name}: {e}")
+        return None
+
 def download_pdfs(sources):
+    # I/O-bound: fetch all sources concurrently; map() keeps the PDF_SOURCES order
     paths = {}
-    for name, url in sources.items():
-        print(f"Downloading {name} from {url}...")
+    if not sources: return paths
+    # Only the current source URLs are worth remembering
+    validators = {url: v for url, v in load_pdf_validators().items() if url in sources.values()}
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        results = executor.map(download_pdf, sources.keys(), sources.values(), [validators] * len(sources))
+        for name, filename in zip(sources.keys(), results):
+            if filename:
+                paths[name] = filename
+    save_pdf_validators(validators)
+    return paths
+
+# Ticker -> history period needed by fetch_live_data
+LIVE_TICKERS = {
+    "^VIX": "1d",
+    "^TNX": "5d", # a few days to ensure we get prev close
+    "DX-Y.NYB": "5d",
+    "CL=F": "5d",
+    "HYG": "5d",
+    "^GSPC": "2mo", # 2mo to safely handle holidays and strict 21-day lookback
+}
+
+def fetch_history(ticker, period, day=None):
+    # Same-day reruns reuse the pickled frame instead of another Yahoo round-trip
+    safe_ticker = re.sub(r'[^A-Za-z0-9]', '_', ticker)
+    path = os.path.join(LIVE_DATA_CACHE_DIR, f"{safe_ticker}_{period}_{day or datetime.now().date()}.pkl")
+    try:
+        if time.time() - os.path.getmtime(path) <= LIVE_DATA_CACHE_TTL_MINUTES * 60:
+            import pandas as pd
+            return pd.read_pickle(path)
+    except Exception:
+        pass
+
+    import yfinance as yf  # deferred: pulls in pandas/numpy
+    # Daily bars only; actions=False skips merging dividend/split events we never read
+    hist = yf.Ticker(ticker).history(period=period, interval="1d", actions=False, timeout=30)
+    if 'Close' in hist:
+        hist = hist[['Close']] # only closes are read; keeps the cached pickle and later copies small
+    if not hist.empty:
         try:
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            filename = f"{name}.pdf"
-            with open(filename, "wb") as f:
-                f.write(response.content)
-            paths[name] = filename
-            print(f"Downloaded {filename}.")
+            os.makedirs(LIVE_DATA_CACHE_DIR, exist_ok=True)
+            hist.to_pickle(path)
         except Exception as e:
-            print(f"Error downloading {name}: {e}")
-    return paths
+            print(f"Warning: Could not cache {ticker} history: {e}")
+    return hist
 
-def fetch_live_data():
+def fetch_live_data(now=None):
     print("Fetching live market data (fallback)...")
+    today_date = (now or datetime.now()).date()
+    # Fire all Yahoo requests at once; each .result() re-raises that ticker's error at the point of use
+    with ThreadPoolExecutor(max_workers=len(LIVE_TICKERS)) as executor:
+        history = {t: executor.submit(fetch_history, t, p, today_date) for t, p in LIVE_TICKERS.items()}
+        return build_live_data(history, today_date)
+
+def build_live_data(history, today_date):
     data = {}
     try:
         # Fetch VIX
-        vix = yf.Ticker("^VIX")
-        hist_vix = vix.history(period="1d")
+        hist_vix = history["^VIX"].result()
         if not hist_vix.empty:
             data['vix_index'] = round(hist_vix['Close'].iloc[-1], 2)
             print(f"Live VIX: {data['vix_index']}")
 
         # Fetch 10Y Yield (^TNX) for precise BPS change
-        tnx = yf.Ticker("^TNX")
-        hist_tnx = tnx.history(period="5d") # Fetch a few days to ensure we get prev close
+        hist_tnx = history["^TNX"].result()
         if len(hist_tnx) >= 2:
             # TNX is in percent (e.g. 4.50 for 4.50%)
             current_yield = hist_tnx['Close'].iloc[-1]
@@ -100,8 +376,7 @@ def fetch_live_data():
         # Fetch Macro Context (DXY, WTI, HYG)
         for ticker, key in [("DX-Y.NYB", "dxy"), ("CL=F", "wti"), ("HYG", "hyg")]:
             try:
-                t = yf.Ticker(ticker)
-                hist = t.history(period="5d")
+                hist = history[ticker].result()
                 if len(hist) >= 2:
                     curr = hist['Close'].iloc[-1]
                     prev = hist['Close'].iloc[-2]
@@ -112,19 +387,19 @@ def fetch_live_data():
                 print(f"Failed to fetch {ticker}: {e}")
 
         # Fetch S&P 500 for Trend/Freshness (using ^GSPC Index)
-        # Fetch 2mo to safely handle holidays and strict 21-day lookback
-        spx = yf.Ticker("^GSPC")
-        hist_spx = spx.history(period="2mo")
+        hist_spx = history["^GSPC"].result()
         
         # Determine strict "Close-to-Close" indices
         if not hist_spx.empty:
-            last_date = hist_spx.index[-1].date()
-            today_date = datetime.now().date()
+            spx_closes = hist_spx['Close'].to_numpy() # plain array: skips pandas indexing for the lookups below
+            spx_dates = hist_spx.index.date # exchange-local calendar dates, converted in one pass
+            spx_len = len(spx_closes)
+            last_date = spx_dates[-1]
             
             # If the last row is today, it's a partial bar (live). Use yesterday's close for trend stability.
             if last_date == today_date:
-                if len(hist_spx) < 2:
-                    print(f"Warning: Insufficient SPX data (only {len(hist_spx)} row) to skip partial bar.")
+                if spx_len < 2:
+                    print(f"Warning: Insufficient SPX data (only {spx_len} row) to skip partial bar.")
                     data['sp500_trend_status'] = "Unknown"
                     data['sp500_1mo_change_pct'] = None
                     data['sp500_trend_audit'] = "Insufficient data (single partial row)"
@@ -134,7 +409,7 @@ def fetch_live_data():
                 current_idx = -1
             
             # Check staleness
-            current_data_date = hist_spx.index[current_idx].date()
+            current_data_date = spx_dates[current_idx]
             days_lag = (today_date - current_data_date).days
             
             if days_lag > 7:
@@ -148,11 +423,11 @@ def fetch_live_data():
             prior_idx = current_idx - 21
             required_len = abs(prior_idx)
             
-            if len(hist_spx) >= required_len:
-                current_close = hist_spx['Close'].iloc[current_idx]
-                prior_close = hist_spx['Close'].iloc[prior_idx]
-                current_date_str = hist_spx.index[current_idx].strftime('%Y-%m-%d')
-                prior_date_str = hist_spx.index[prior_idx].strftime('%Y-%m-%d')
+            if spx_len >= required_len:
+                current_close = spx_closes[current_idx]
+                prior_close = spx_closes[prior_idx]
+                current_date_str = current_data_date.isoformat()
+                prior_date_str = spx_dates[prior_idx].isoformat()
 
                 pct_change = ((current_close - prior_close) / prior_close) * 100
                 
@@ -168,7 +443,7 @@ def fetch_live_data():
                 
                 print(f"SPX Trend: {trend_status} ({pct_change:.2f}%) | {data['sp500_trend_audit']}")
             else:
-                print(f"Warning: Insufficient SPX data. Rows: {len(hist_spx)}, Required: {required_len}")
+                print(f"Warning: Insufficient SPX data. Rows: {spx_len}, Required: {required_len}")
                 data['sp500_trend_status'] = "Unknown"
                 data['sp500_1mo_change_pct'] = None
                 data['sp500_trend_audit'] = "Insufficient data"
@@ -291,108 +566,67 @@ def generate_verification_block(effective_date, extracted_metrics, cme_signals,
 """
     return block
 
+# --- Score Formulas ---
+# Pure float -> float functions (no dict access, no I/O) so they can be reused for backtests
+
+def clamp_score(x):
+    return round(min(max(x, 0), 10), 1)
+
+MEDIAN_HY_SPREAD = 4.5 # Long-run HY spread (%) that maps to a neutral 5.0
+
+def liquidity_score(hy_spread, real_yield):
+    if hy_spread <= 0: hy_spread = 0.01
+    spread_component = 5.0 + (math.log2(MEDIAN_HY_SPREAD / hy_spread) * 3.0)
+    ry_penalty = max(0, (real_yield - 1.5) * 2.0)
+    return clamp_score(spread_component - ry_penalty)
+
+def valuation_score(pe_ratio):
+    return clamp_score(5.0 + ((pe_ratio - 18.0) * 0.66))
+
+def inflation_score(inf_exp):
+    return clamp_score(5.0 + ((inf_exp - 2.25) * 10.0))
+
+def credit_score(hy_spread):
+    if hy_spread < 3.0: return clamp_score(2.0)
+    return clamp_score(2.0 + ((hy_spread - 3.0) * 1.6))
+
+def growth_score(y10, y2):
+    return clamp_score(5.0 + (((y10 - y2) - 0.50) * 3.5))
+
+def risk_score(vix):
+    return clamp_score(10.0 - ((vix - 10.0) * 0.5))
+
+# Dial -> (input keys, formula, default score, missing-data label, detail for a calculated score).
+# Any missing input falls back to the default; a formula error (e.g. a non-numeric extraction) does too.
+SCORE_SPECS = {
+    "Liquidity Conditions": (("hy_spread_current", "real_yield_10y"), liquidity_score, 5.0, "Missing Data", lambda hy, ry: "Spread + Real Yield"),
+    "Valuation Risk": (("forward_pe_current",), valuation_score, 5.0, "Missing P/E", lambda pe: f"P/E {pe}"),
+    "Inflation Pressure": (("inflation_expectations_5y5y",), inflation_score, 5.0, "Missing 5y5y", lambda inf: f"5y5y {inf}%"),
+    "Credit Stress": (("hy_spread_current",), credit_score, 5.0, "Missing Spread", lambda hy: f"Spread {hy}%"),
+    "Growth Impulse": (("yield_10y", "yield_2y"), growth_score, 5.0, "Missing Yields", lambda y10, y2: f"Curve {y10 - y2:.2f}%"),
+    "Risk Appetite": (("vix_index",), risk_score, 7.0, "Missing VIX", lambda vix: f"VIX {vix}"),
+}
+
 def calculate_deterministic_scores(extracted_data):
     print("Calculating deterministic scores...")
     scores = {}
     details = {}
     data = extracted_data or {}
-    
-    # LIQUIDITY
-    try:
-        hy_spread = data.get('hy_spread_current')
-        real_yield = data.get('real_yield_10y')
-        if hy_spread is not None and real_yield is not None:
-            median_spread = 4.5
-            if hy_spread <= 0: hy_spread = 0.01 
-            spread_component = 5.0 + (math.log(median_spread / hy_spread, 2) * 3.0)
-            ry_penalty = max(0, (real_yield - 1.5) * 2.0)
-            final_liq = spread_component - ry_penalty
-            scores['Liquidity Conditions'] = round(min(max(final_liq, 0), 10), 1)
-            details['Liquidity Conditions'] = "Calculated (Spread + Real Yield)"
-        else:
-            scores['Liquidity Conditions'] = 5.0
-            details['Liquidity Conditions'] = "Default (Missing Data)"
-    except Exception as e:
-        print(f"Error calc Liquidity: {e}")
-        scores['Liquidity Conditions'] = 5.0
-        details['Liquidity Conditions'] = "Error (Defaulted)"
-
-    # VALUATION
-    try:
-        pe_ratio = data.get('forward_pe_current')
-        if pe_ratio is not None:
-            val_score = 5.0 + ((pe_ratio - 18.0) * 0.66)
-            scores['Valuation Risk'] = round(min(max(val_score, 0), 10), 1)
-            details['Valuation Risk'] = f"Calculated (P/E {pe_ratio})"
-        else:
-            scores['Valuation Risk'] = 5.0
-            details['Valuation Risk'] = "Default (Missing P/E)"
-    except Exception as e:
-        print(f"Error calc Valuation: {e}")
-        scores['Valuation Risk'] = 5.0
-        details['Valuation Risk'] = "Error (Defaulted)"
-
-    # INFLATION
-    try:
-        inf_exp = data.get('inflation_expectations_5y5y')
-        if inf_exp is not None:
-            inf_score = 5.0 + ((inf_exp - 2.25) * 10.0)
-            scores['Inflation Pressure'] = round(min(max(inf_score, 0), 10), 1)
-            details['Inflation Pressure'] = f"Calculated (5y5y {inf_exp}%)"
-        else:
-            scores['Inflation Pressure'] = 5.0
-            details['Inflation Pressure'] = "Default (Missing 5y5y)"
-    except Exception as e:
-        print(f"Error calc Inflation: {e}")
-        scores['Inflation Pressure'] = 5.0
-        details['Inflation Pressure'] = "Error (Defaulted)"
-
-    # CREDIT
-    try:
-        hy_spread = data.get('hy_spread_current')
-        if hy_spread is not None:
-            if hy_spread < 3.0: stress_score = 2.0
-            else: stress_score = 2.0 + ((hy_spread - 3.0) * 1.6)
-            scores['Credit Stress'] = round(min(max(stress_score, 0), 10), 1)
-            details['Credit Stress'] = f"Calculated (Spread {hy_spread}%)"
-        else:
-            scores['Credit Stress'] = 5.0
-            details['Credit Stress'] = "Default (Missing Spread)"
-    except Exception as e:
-        print(f"Error calc Credit: {e}")
-        scores['Credit Stress'] = 5.0
-        details['Credit Stress'] = "Error (Defaulted)"
 
-    # GROWTH
-    try:
-        y10 = data.get('yield_10y')
-        y2 = data.get('yield_2y')
-        if y10 is not None and y2 is not None:
-            curve_slope = y10 - y2
-            growth_score = 5.0 + ((curve_slope - 0.50) * 3.5)
-            scores['Growth Impulse'] = round(min(max(growth_score, 0), 10), 1)
-            details['Growth Impulse'] = f"Calculated (Curve {curve_slope:.2f}%)"
-        else:
-            scores['Growth Impulse'] = 5.0
-            details['Growth Impulse'] = "Default (Missing Yields)"
-    except Exception as e:
-        print(f"Error calc Growth: {e}")
-        scores['Growth Impulse'] = 5.0
-        details['Growth Impulse'] = "Error (Defaulted)"
-
-    # RISK
-    try:
-        vix = data.get('vix_index')
-        if vix is not None:
-            risk_score = 10.0 - ((vix - 10.0) * 0.5)
-            scores['Risk Appetite'] = round(min(max(risk_score, 0), 10), 1)
-            details['Risk Appetite'] = f"Calculated (VIX {vix})"
-        else:
-            scores['Risk Appetite'] = 7.0 
-            details['Risk Appetite'] = "Default (Missing VIX)"
-    except:
-        scores['Risk Appetite'] = 7.0
-        details['Risk Appetite'] = "Error (Defaulted)"
+    for dial, (keys, formula, default, missing_label, describe) in SCORE_SPECS.items():
+        values = [data.get(k) for k in keys]
+        if None in values:
+            scores[dial] = default
+            details[dial] = f"Default ({missing_label})"
+            continue
+        try:
+            score = formula(*values)
+            details[dial] = f"Calculated ({describe(*values)})"
+            scores[dial] = score
+        except Exception as e:
+            print(f"Error calc {dial}: {e}")
+            scores[dial] = default
+            details[dial] = "Error (Defaulted)"
     
     print(f"Calculated Scores: {scores}")
     return scores, details
@@ -501,67 +735,152 @@ def process_cme_sec09(raw_data):
         }
     }
 
-def extract_metrics_gemini(pdf_paths, prompt_override=None):
+def load_upload_index():
+    # sha256 -> {"name", "expires"} for files still live in the Gemini File API (they expire after 48h)
+    try:
+        with open(GEMINI_UPLOAD_INDEX, "rb") as f:
+            index = orjson.loads(f.read())
+    except Exception:
+        return {}
+    now = datetime.now(timezone.utc).isoformat()
+    return {h: e for h, e in index.items() if e.get("expires", "") > now}
+
+def save_upload_index(index):
+    try:
+        os.makedirs(os.path.dirname(GEMINI_UPLOAD_INDEX), exist_ok=True)
+        with open(GEMINI_UPLOAD_INDEX, "wb") as f:
+            f.write(orjson.dumps(index))
+    except Exception as e:
+        print(f"Warning: Could not save Gemini upload index: {e}")
+
+def upload_pdf_cached(path, index):
+    genai = get_genai()
+    with open(path, "rb") as fh:
+        digest = hashlib.file_digest(fh, "sha256").hexdigest()
+    entry = index.get(digest)
+    if entry:
+        try:
+            f = genai.get_file(entry["name"])
+            # Leave headroom so the handle can't expire mid-run
+            if f.state.name == "ACTIVE" and f.expiration_time > datetime.now(timezone.utc) + timedelta(hours=1):
+                print(f"Reusing Gemini upload {f.name} for {path}.")
+                return f
+        except Exception as e:
+            print(f"Cached Gemini upload for {path} unavailable ({e}); re-uploading.")
+    f = genai.upload_file(path, mime_type="application/pdf")
+    index[digest] = {"name": f.name, "expires": f.expiration_time.isoformat()}
+    return f
+
+def upload_pdfs_gemini(pdf_paths):
+    # Upload each PDF once per run (shared by extraction and summarization) and
+    # reuse identical uploads from earlier runs, e.g. a same-day retry
+    if not AI_STUDIO_API_KEY: return {}
+    index = load_upload_index()
+    gemini_files = {}
+    # Uploads are independent network transfers; send them concurrently (index writes use distinct keys)
+    with ThreadPoolExecutor(max_workers=max(len(pdf_paths), 1)) as executor:
+        futures = {}
+        for name, path in pdf_paths.items():
+            print(f"Uploading {name} ({path}) to Gemini...")
+            futures[name] = executor.submit(upload_pdf_cached, path, index)
+        for name, future in futures.items():
+            try:
+                gemini_files[name] = future.result()
+            except Exception as e:
+                print(f"Gemini upload failed for {name}: {e}")
+    save_upload_index(index)
+    return gemini_files
+
+def extract_metrics_gemini(gemini_files, prompt_override=None):
     print("Extracting Ground Truth Data with Gemini...")
     if not AI_STUDIO_API_KEY: 
         print("Error: AI_STUDIO_API_KEY not found. Skipping PDF extraction.")
         return {}
+    if not gemini_files:
+        print("Error: No uploaded documents available. Skipping PDF extraction.")
+        return {}
 
-    genai.configure(api_key=AI_STUDIO_API_KEY)
-    model = genai.GenerativeModel(GEMINI_MODEL)
+    genai = get_genai()
+    # Flash tier is plenty for reading numbers off the PDFs; JSON mode guarantees parseable output
+    model = genai.GenerativeModel(
+        GEMINI_EXTRACT_MODEL,
+        generation_config={"response_mime_type": "application/json"}
+    )
     
     try:
-        content = [prompt_override if prompt_override else EXTRACTION_PROMPT]
-        for name, path in pdf_paths.items():
-            print(f"Uploading {name} ({path})...")
-            f = genai.upload_file(path, mime_type="application/pdf")
+        prompt = prompt_override if prompt_override else EXTRACTION_PROMPT
+        # Same PDF bytes + same prompt = same numbers; reruns (and a second trigger in one day) skip the call
+        file_hashes = [f"{name}:{getattr(f, 'sha256_hash', None) or f.name}" for name, f in gemini_files.items()]
+        cache_key = llm_cache_key("extract", GEMINI_EXTRACT_MODEL, prompt, *file_hashes)
+        cached = llm_cache_get(cache_key)
+        if cached is not None:
+            data = orjson.loads(cached)
+            print(f"Using cached extraction: {data}")
+            return data
+
+        content = [prompt]
+        for name, f in gemini_files.items():
             content.append(f"Document: {name}")
             content.append(f)
             
-        response = model.generate_content(content)
-        text = response.text.replace("```json", "").replace("```", "").strip()
-        data = json.loads(text)
+        response = generate_with_retry(model, content)
+        data = orjson.loads(response.text)
         print(f"Extracted Data: {data}")
+        llm_cache_put(cache_key, GEMINI_EXTRACT_MODEL, response.text) # only reached once the JSON parsed
         return data
     except Exception as e:
         print(f"Extraction failed (CME/WisdomTree Source): {e}")
         return {}
 
-def summarize_openrouter(pdf_paths, ground_truth, event_context, model_override=None):
+def split_template(template, *fields):
+    # Literal text around each {field}, in order; filling is a plain join, so braces elsewhere in the prompt are safe
+    parts = []
+    for field in fields:
+        head, _, template = template.partition("{" + field + "}")
+        parts.append(head)
+    parts.append(template)
+    return parts
+
+SUMMARY_PROMPT_PARTS = split_template(SUMMARY_SYSTEM_PROMPT, "ground_truth_json", "event_context_json")
+
+def build_summary_prompt(ground_truth, event_context):
+    # Built once per run and shared by every provider/model
+    if RUN_MODE == "BENCHMARK":
+        return BENCHMARK_SYSTEM_PROMPT + f"\n\n{PROMPT_DATA_MARKER}\n\nEvent Context:\n{dumps_canonical(event_context)}"
+    if RUN_MODE == "BENCHMARK_JSON":
+        return BENCHMARK_DATA_SYSTEM_PROMPT + f"\n\n{PROMPT_DATA_MARKER}\n\nGround Truth Data:\n{dumps_canonical(ground_truth)}\n\nEvent Context:\n{dumps_canonical(event_context)}"
+    head, mid, tail = SUMMARY_PROMPT_PARTS
+    return "".join([head, dumps_canonical(ground_truth), mid, dumps_canonical(event_context), tail])
+
+def collect_vision_images(pdf_paths):
+    # Page images sent to OpenRouter vision models (full WisdomTree deck + first page of each CME section).
+    # Returned as ready-made data URLs so every model request reuses the same encoded strings.
+    images = []
+    if RUN_MODE == "BENCHMARK_JSON":
+        return images
+    for name, (max_pages, zoom, grayscale) in VISION_RENDER.items():
+        if name in pdf_paths:
+            images.extend(pdf_to_images(pdf_paths[name], max_pages=max_pages, zoom=zoom, grayscale=grayscale))
+    return ["data:image/jpeg;base64," + base64.b64encode(img_bytes).decode('ascii') for img_bytes in images]
+
+def summarize_openrouter(images, formatted_prompt, model_override=None):
     target_model = model_override if model_override else OPENROUTER_MODEL
     print(f"Summarizing with OpenRouter ({target_model})...")
     if not OPENROUTER_API_KEY: return "Error: Key missing"
-    
-    images = []
-    if RUN_MODE != "BENCHMARK_JSON":
-        if "wisdomtree" in pdf_paths:
-            images.extend(pdf_to_images(pdf_paths["wisdomtree"]))
-        if "cme_sec01" in pdf_paths:
-            cme_images = pdf_to_images(pdf_paths["cme_sec01"])
-            images.extend(cme_images[:1])
-        if "cme_sec09" in pdf_paths:
-            sec09_images = pdf_to_images(pdf_paths["cme_sec09"])
-            images.extend(sec09_images[:1])
-        if "cme_sec11" in pdf_paths:
-            sec11_images = pdf_to_images(pdf_paths["cme_sec11"])
-            images.extend(sec11_images[:1])
-    
-    if RUN_MODE == "BENCHMARK":
-        formatted_prompt = BENCHMARK_SYSTEM_PROMPT + f"\n\nEvent Context:\n{json.dumps(event_context, indent=2)}"
-    elif RUN_MODE == "BENCHMARK_JSON":
-        formatted_prompt = BENCHMARK_DATA_SYSTEM_PROMPT + f"\n\nGround Truth Data:\n{json.dumps(ground_truth, indent=2)}\n\nEvent Context:\n{json.dumps(event_context, indent=2)}"
-    else:
-        formatted_prompt = SUMMARY_SYSTEM_PROMPT.format(
-            ground_truth_json=json.dumps(ground_truth, indent=2),
-            event_context_json=json.dumps(event_context, indent=2)
-        )
-    
-    content_list = [{"type": "text", "text": formatted_prompt}]
-    for img_b64 in images:
+
+    # Prompt caching: static instructions first, then page images, then the per-run data tail.
+    # cache_control breakpoints mark the end of each reusable prefix (Anthropic/Gemini via OpenRouter).
+    static_prefix, marker, data_tail = formatted_prompt.partition(PROMPT_DATA_MARKER)
+    content_list = [{"type": "text", "text": static_prefix, "cache_control": {"type": "ephemeral"}}]
+    for img_url in images:
         content_list.append({
             "type": "image_url",
-            "image_url": {"url": f"data:image/jpeg;base64,{img_b64}"}
+            "image_url": {"url": img_url}
         })
+    if images:
+        content_list[-1]["cache_control"] = {"type": "ephemeral"}
+    if data_tail:
+        content_list.append({"type": "text", "text": marker + data_tail})
 
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
@@ -573,85 +892,137 @@ def summarize_openrouter(pdf_paths, ground_truth, event_context, model_override=
         "model": target_model,
         "messages": [{"role": "user", "content": content_list}]
     }
+    body_bytes = orjson.dumps(body)
+
+    # The serialized body covers model, prompt and every image
+    cache_key = llm_cache_key("openrouter", body_bytes)
+    cached = llm_cache_get(cache_key)
+    if cached is not None:
+        print(f"Using cached OpenRouter response ({target_model}).")
+        return cached
     
     try:
-        response = requests.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=body, timeout=300)
+        response = post_with_retry("https://openrouter.ai/api/v1/chat/completions", headers=headers, data=body_bytes, timeout=OPENROUTER_TIMEOUT)
         if response.status_code != 200:
             return f"Error {response.status_code}: {response.text}"
-        return response.json()["choices"][0]["message"]["content"]
+        payload = response.json()
+        usage = payload.get("usage") or {}
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+        print(f"OpenRouter usage ({target_model}): prompt={usage.get('prompt_tokens')} cached={cached_tokens} completion={usage.get('completion_tokens')}")
+        choice = payload["choices"][0]
+        text = choice["message"]["content"]
+        # Only cache complete replies; an empty or length-truncated summary should be retried next run
+        if text and choice.get("finish_reason") == "stop":
+            llm_cache_put(cache_key, target_model, text)
+        return text
     except Exception as e:
         return f"OpenRouter Error: {e}"
 
-def summarize_gemini(pdf_paths, ground_truth, event_context):
-    print(f"Summarizing with Gemini ({GEMINI_MODEL})...")
+def summarize_gemini(gemini_files, formatted_prompt):
+    print(f"Summarizing with Gemini ({GEMINI_SUMMARY_MODEL})...")
     if not AI_STUDIO_API_KEY: return "Error: Key missing"
 
-    genai.configure(api_key=AI_STUDIO_API_KEY)
-    model = genai.GenerativeModel(GEMINI_MODEL)
+    # Same layout as OpenRouter: byte-stable instructions as the system instruction, then documents,
+    # then the per-run data tail, so Gemini's implicit prefix cache can hit across calls and runs.
+    # Note this makes the whole instruction block a system instruction rather than user text, which
+    # Gemini weights as standing guidance. No explicit CachedContent: the documents change daily and
+    # the prompt is used once per run, so a created cache would never be read twice.
+    static_prefix, marker, data_tail = formatted_prompt.partition(PROMPT_DATA_MARKER)
+    genai = get_genai()
+    model = genai.GenerativeModel(GEMINI_SUMMARY_MODEL, system_instruction=static_prefix)
     
-    if RUN_MODE == "BENCHMARK":
-        formatted_prompt = BENCHMARK_SYSTEM_PROMPT + f"\n\nEvent Context:\n{json.dumps(event_context, indent=2)}"
-    elif RUN_MODE == "BENCHMARK_JSON":
-        formatted_prompt = BENCHMARK_DATA_SYSTEM_PROMPT + f"\n\nGround Truth Data:\n{json.dumps(ground_truth, indent=2)}\n\nEvent Context:\n{json.dumps(event_context, indent=2)}"
-    else:
-        formatted_prompt = SUMMARY_SYSTEM_PROMPT.format(
-            ground_truth_json=json.dumps(ground_truth, indent=2),
-            event_context_json=json.dumps(event_context, indent=2)
-        )
-    
-    content = [formatted_prompt]
+    content = []
     
     if RUN_MODE != "BENCHMARK_JSON":
-        try:
-            for name, path in pdf_paths.items():
-                f = genai.upload_file(path, mime_type="application/pdf")
-                content.append(f"Document: {name}")
-                content.append(f)
-        except Exception as e:
-            return f"Gemini Upload Error: {e}"
+        if not gemini_files:
+            return "Gemini Upload Error: No documents were uploaded"
+        for name, f in gemini_files.items():
+            content.append(f"Document: {name}")
+            content.append(f)
+
+    content.append(marker + data_tail)
+
+    # Uploaded file handles differ per upload; key on the content hash Gemini reports instead
+    file_hashes = [getattr(f, "sha256_hash", None) or f.name for f in gemini_files.values()] if RUN_MODE != "BENCHMARK_JSON" else []
+    cache_key = llm_cache_key("gemini", GEMINI_SUMMARY_MODEL, formatted_prompt, *file_hashes)
+    cached = llm_cache_get(cache_key)
+    if cached is not None:
+        print(f"Using cached Gemini response ({GEMINI_SUMMARY_MODEL}).")
+        return cached
             
     try:
-        response = model.generate_content(content)
-        return response.text
+        response = generate_with_retry(model, content)
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            print(f"Gemini usage ({GEMINI_SUMMARY_MODEL}): prompt={usage.prompt_token_count} cached={getattr(usage, 'cached_content_token_count', 0)} completion={usage.candidates_token_count}")
+        text = response.text
+        if text:
+            llm_cache_put(cache_key, GEMINI_SUMMARY_MODEL, text)
+        return text
     except Exception as e:
         return f"Gemini Error: {e}"
 
+# --- Output Cleaning Patterns (compiled once; clean_llm_output runs per summary/model) ---
+
+# Attribution language replaced with neutral "market participants"
+ATTRIBUTION_ADJ_PATTERN = re.compile(r"\b(institutional)\b", re.IGNORECASE)
+ATTRIBUTION_NOUN_PATTERN = re.compile(r"\b(smart money|whales?|insiders?|institutions?|big players?|professionals?|strong hands?|hedge funds?|asset managers?|dealers?|banks?|allocators?|funds?|big money|real money|pensions?|pension funds?|sovereign|sovereign wealth|macro funds?|levered funds?|CTAs)\b", re.IGNORECASE)
+HEDGING_VOL_PATTERN = re.compile(r"\bHedging/Vol\b", re.IGNORECASE)
+
+# Expanded Directional Vocabulary
+DIRECTIONAL_LEAKAGE_PATTERN = re.compile(r"\b(bullish|bearish|conviction|aggressive|rally|selloff|breakout|risk[- ]on|risk[- ]off|bull steepener|bear steepener|short covering|long liquidation|new longs|new shorts|breakdown|melt[- ]up|buying the dip|selling the rip|upside bias|downside bias|tilted? bullish|tilted? bearish|skewed? bullish|skewed? bearish|upside skew|downside skew|risk[- ]on skew|risk[- ]off skew|bull bias|bear bias)\b", re.IGNORECASE)
+SECTION_SPLIT_PATTERN = re.compile(r"(?m)(?=^#{2,4}\s)")
+# Whole lines that change the tracked section or carry a Signal:/Direction: field
+SIGNAL_LINE_PATTERN = re.compile(r"^.*(?:\[SECTION:(?:RATES|EQUITIES|SUMMARY)\]|Signal:|Direction:).*$", re.MULTILINE)
+
+# Scoreboard dial -> justification terms that belong to a different dial (prefix match)
+SCOREBOARD_CONSTRAINTS = {
+    dial: [(word, re.compile(r'\b' + re.escape(word) + r'\w*')) for word in words]
+    for dial, words in {
+        "Growth Impulse": ["spread", "credit", "hyg", "junk", "default"],
+        "Liquidity Conditions": ["spread", "hyg", "junk", "credit", "default"], 
+        "Credit Stress": ["p/e", "valuation", "earnings", "curve", "slope", "10y", "2y", "yield"],
+        "Valuation Risk": ["spread", "credit", "vix", "curve", "yield", "slope"],
+        "Inflation Pressure": ["vix", "participation", "volume", "p/e", "valuation"],
+        "Risk Appetite": ["p/e", "valuation", "earnings", "curve", "slope"]
+    }.items()
+}
+
 def clean_llm_output(text, cme_signals=None):
-    text = text.strip()
-    if text.startswith("```markdown"): text = text[11:]
-    elif text.startswith("```"): text = text[3:]
-    if text.endswith("```"): text = text[:-3]
+    text = FENCE_PATTERN.sub("", text).strip()
     
     # Pass 1: Adjectives
-    adj_pattern = re.compile(r"\b(institutional)\b", re.IGNORECASE)
-    if adj_pattern.search(text):
+    if ATTRIBUTION_ADJ_PATTERN.search(text):
         print("Warning: Banned adjective found. Normalizing...")
-        text = adj_pattern.sub("market-participant", text)
+        text = ATTRIBUTION_ADJ_PATTERN.sub("market-participant", text)
         if "Language normalization applied" not in text:
             text += "\n\n*(Note: Language normalization applied to remove attribution)*"
 
     # Pass 2: Nouns
-    noun_pattern = re.compile(r"\b(smart money|whales?|insiders?|institutions?|big players?|professionals?|strong hands?|hedge funds?|asset managers?|dealers?|banks?|allocators?|funds?|big money|real money|pensions?|pension funds?|sovereign|sovereign wealth|macro funds?|levered funds?|CTAs)\b", re.IGNORECASE)
-    if noun_pattern.search(text):
+    if ATTRIBUTION_NOUN_PATTERN.search(text):
         print("Warning: Banned noun found. Normalizing...")
-        text = noun_pattern.sub("market participants", text)
+        text = ATTRIBUTION_NOUN_PATTERN.sub("market participants", text)
         if "Language normalization applied" not in text:
             text += "\n\n*(Note: Language normalization applied to remove attribution)*"
     
     # Normalize Signal Vocabulary
-    text = re.sub(r"\bHedging/Vol\b", "Hedging-Vol", text, flags=re.IGNORECASE)
+    text = HEDGING_VOL_PATTERN.sub("Hedging-Vol", text)
 
     # Pass 3: Targeted Directional Leakage Validator
     if cme_signals:
         eq_sig_val = cme_signals.get('equity', {}).get('signal_label', 'Unknown')
         rt_sig_val = cme_signals.get('rates', {}).get('signal_label', 'Unknown')
         
+        eq_allowed = cme_signals.get('equity', {}).get('direction_allowed', True)
+        rt_allowed = cme_signals.get('rates', {}).get('direction_allowed', True)
+
         # 3a. Force-Overwrite "Signal:" lines with Deterministic Truth
-        lines = text.split('\n')
-        new_lines = []
+        # One regex pass visits only sentinel/Signal/Direction lines; section state carries between matches
         current_section = "Unknown"
-        
-        for line in lines:
+
+        def enforce_signal_line(match):
+            nonlocal current_section
+            line = match.group(0)
             # Detect Section using deterministic sentinels
             if "[SECTION:RATES]" in line:
                 current_section = "Rates"
@@ -663,34 +1034,18 @@ def clean_llm_output(text, cme_signals=None):
             # Detect Signal/Direction Lines
             if "Signal:" in line:
                 if current_section == "Rates":
-                    prefix = line.split("Signal:")[0]
-                    line = f"{prefix}Signal: {rt_sig_val}"
-                elif current_section == "Equities":
-                    prefix = line.split("Signal:")[0]
-                    line = f"{prefix}Signal: {eq_sig_val}"
+                    return f"{line.split('Signal:')[0]}Signal: {rt_sig_val}"
+                if current_section == "Equities":
+                    return f"{line.split('Signal:')[0]}Signal: {eq_sig_val}"
             elif "Direction:" in line:
                 # Enforcement/Normalization
-                eq_allowed = cme_signals.get('equity', {}).get('direction_allowed', True)
-                rt_allowed = cme_signals.get('rates', {}).get('direction_allowed', True)
-                
-                if current_section == "Rates" and not rt_allowed:
-                    prefix = line.split("Direction:")[0]
-                    line = f"{prefix}Direction: Unknown"
-                elif current_section == "Equities" and not eq_allowed:
-                    prefix = line.split("Direction:")[0]
-                    line = f"{prefix}Direction: Unknown"
-            
-            new_lines.append(line)
-        
-        text = "\n".join(new_lines)
+                if (current_section == "Rates" and not rt_allowed) or (current_section == "Equities" and not eq_allowed):
+                    return f"{line.split('Direction:')[0]}Direction: Unknown"
+            return line
 
-        eq_allowed = cme_signals.get('equity', {}).get('direction_allowed', True)
-        rt_allowed = cme_signals.get('rates', {}).get('direction_allowed', True)
-        
-        # Expanded Directional Vocabulary
-        leakage_pattern = re.compile(r"\b(bullish|bearish|conviction|aggressive|rally|selloff|breakout|risk[- ]on|risk[- ]off|bull steepener|bear steepener|short covering|long liquidation|new longs|new shorts|breakdown|melt[- ]up|buying the dip|selling the rip|upside bias|downside bias|tilted? bullish|tilted? bearish|skewed? bullish|skewed? bearish|upside skew|downside skew|risk[- ]on skew|risk[- ]off skew|bull bias|bear bias)\b", re.IGNORECASE)
+        text = SIGNAL_LINE_PATTERN.sub(enforce_signal_line, text)
         
-        sections = re.split(r"(?m)(?=^#{2,4}\s)", text)
+        sections = SECTION_SPLIT_PATTERN.split(text)
         processed_sections = []
         filter_applied = False
         
@@ -702,9 +1057,9 @@ def clean_llm_output(text, cme_signals=None):
             if is_rates and not rt_allowed: should_scrub = True
             if is_equities and not eq_allowed: should_scrub = True
             
-            if should_scrub and leakage_pattern.search(section):
+            if should_scrub and DIRECTIONAL_LEAKAGE_PATTERN.search(section):
                 # Aggressive Redaction
-                section = leakage_pattern.sub("[neutral phrasing enforced]", section)
+                section = DIRECTIONAL_LEAKAGE_PATTERN.sub("[neutral phrasing enforced]", section)
                 filter_applied = True
             
             processed_sections.append(section)
@@ -721,16 +1076,6 @@ def clean_llm_output(text, cme_signals=None):
     in_scoreboard = False
     new_lines_pass4 = []
     
-    # Constraints Mapping
-    sb_constraints = {
-        "Growth Impulse": ["spread", "credit", "hyg", "junk", "default"],
-        "Liquidity Conditions": ["spread", "hyg", "junk", "credit", "default"], 
-        "Credit Stress": ["p/e", "valuation", "earnings", "curve", "slope", "10y", "2y", "yield"],
-        "Valuation Risk": ["spread", "credit", "vix", "curve", "yield", "slope"],
-        "Inflation Pressure": ["vix", "participation", "volume", "p/e", "valuation"],
-        "Risk Appetite": ["p/e", "valuation", "earnings", "curve", "slope"]
-    }
-
     for line in lines:
         if "### 1. The Dashboard" in line:
             in_scoreboard = True
@@ -747,10 +1092,10 @@ def clean_llm_output(text, cme_signals=None):
                 # Check for constraints
                 forbidden_found = False
                 found_word = ""
-                for dial_key, forbidden_list in sb_constraints.items():
+                for dial_key, forbidden_list in SCOREBOARD_CONSTRAINTS.items():
                     if dial_key in dial_name:
-                        for word in forbidden_list:
-                            if re.search(r'\b' + re.escape(word) + r'\w*', justification):
+                        for word, word_pattern in forbidden_list:
+                            if word_pattern.search(justification):
                                 forbidden_found = True
                                 found_word = word
                                 break
@@ -766,17 +1111,11 @@ def clean_llm_output(text, cme_signals=None):
     text = "\n".join(new_lines_pass4)
 
     # Inject TOC Anchors
-    text = re.sub(r"(?i)(### 1\. The Dashboard.*SECTION:DASHBOARD\])", r'<a id="scoreboard"></a>\n\1', text)
-    text = re.sub(r"(?i)(### 2\. Executive Takeaway.*SECTION:SUMMARY\])", r'<a id="takeaway"></a>\n\1', text)
-    text = re.sub(r"(?i)(### 3\. The .*Fiscal.*SECTION:FISCAL\])", r'<a id="fiscal"></a>\n\1', text)
-    text = re.sub(r"(?i)(### 4\. Rates.*SECTION:RATES\])", r'<a id="rates"></a>\n\1', text)
-    text = re.sub(r"(?i)(### 5\. The .*Canary.*SECTION:CREDIT\])", r'<a id="credit"></a>\n\1', text)
-    text = re.sub(r"(?i)(### 6\. The .*Engine.*SECTION:EQUITIES\])", r'<a id="engine"></a>\n\1', text)
-    text = re.sub(r"(?i)(### 7\. Valuation.*SECTION:VALUATION\])", r'<a id="valuation"></a>\n\1', text)
-    text = re.sub(r"(?i)(### 8\. Conclusion.*SECTION:CONCLUSION\])", r'<a id="conclusion"></a>\n\1', text)
+    for pattern, anchor in TOC_ANCHOR_PATTERNS:
+        text = pattern.sub(anchor, text)
 
     # Strip Sentinels from final output
-    text = re.sub(r"\s*\[SECTION:[A-Z]+\]", "", text)
+    text = SENTINEL_PATTERN.sub("", text)
 
     # Markdown Hardening
     if text.count("**") % 2 != 0:
@@ -784,13 +1123,18 @@ def clean_llm_output(text, cme_signals=None):
 
     return text.strip()
 
+# Built once: loading the CA trust store is the expensive part of a TLS client context
+SMTP_SSL_CONTEXT = ssl.create_default_context()
+
 def send_email(subject, body_markdown, pages_url):
     print("Sending email...")
-    if not (SMTP_EMAIL and SMTP_PASSWORD and RECIPIENT_EMAIL): return
+    if not (SMTP_EMAIL and SMTP_PASSWORD and RECIPIENT_EMAIL): return False
+
+    # RECIPIENT_EMAIL may be a comma-separated list; each recipient gets their own copy
+    recipients = [r.strip() for r in RECIPIENT_EMAIL.split(",") if r.strip()]
 
     msg = MIMEMultipart()
     msg['From'] = SMTP_EMAIL
-    msg['To'] = RECIPIENT_EMAIL
     msg['Subject'] = subject
 
     full_body = body_markdown
@@ -800,51 +1144,94 @@ def send_email(subject, body_markdown, pages_url):
     msg.attach(MIMEText(full_body, 'plain'))
 
     try:
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
+        # One TLS handshake + login for all recipients
+        with smtplib.SMTP_SSL('smtp.gmail.com', 465, context=SMTP_SSL_CONTEXT, timeout=30) as server:
             server.login(SMTP_EMAIL, SMTP_PASSWORD)
-            server.send_message(msg)
+            for recipient in recipients:
+                del msg['To']
+                msg['To'] = recipient
+                server.send_message(msg)
         print("Email sent successfully.")
+        return True
     except Exception as e:
         print(f"Failed to send email: {e}")
+        return False
+
+def load_report_state():
+    try:
+        with open(REPORT_STATE_FILE, "rb") as f:
+            return orjson.loads(f.read())
+    except Exception:
+        return {}
+
+def save_report_state(state):
+    try:
+        os.makedirs(os.path.dirname(REPORT_STATE_FILE), exist_ok=True)
+        with open(REPORT_STATE_FILE, "wb") as f:
+            f.write(orjson.dumps(state))
+    except Exception as e:
+        print(f"Warning: Could not save report state: {e}")
 
 def main():
-    today = datetime.now().strftime("%Y-%m-%d")
+    # One clock read for the whole run so live data, filenames and the report footer agree across midnight
+    now = datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    prune_cache()
+
+    # Independent stages share one background pool: live market data needs no PDFs, so it starts
+    # before the downloads; rasterization and the three Gemini extractions start once PDFs land.
+    background = ThreadPoolExecutor(max_workers=5)
+    live_future = background.submit(fetch_live_data, now)
     
     try:
         pdf_paths = download_pdfs(PDF_SOURCES)
     except Exception as e:
         print(f"Error fetching PDFs: {e}")
+        background.shutdown(wait=False)
         return
 
     # Phase 1: Ground Truth Extraction
-    extracted_metrics = {}
-    sec09_raw = {}
-    sec11_raw = {}
     algo_scores = {}
+
+    # Rasterize pages for OpenRouter in the background while Gemini extracts (independent work)
+    images_future = None
+    if SUMMARIZE_PROVIDER in ["ALL", "OPENROUTER"] or RUN_MODE.startswith("BENCHMARK"):
+        images_future = background.submit(collect_vision_images, pdf_paths)
+
+    # Gemini File API uploads, shared by extraction and summarization
+    gemini_files = {}
+    if SUMMARIZE_PROVIDER in ["ALL", "GEMINI"] or RUN_MODE == "BENCHMARK":
+        gemini_files = upload_pdfs_gemini(pdf_paths)
     
+    # The three extractions are independent Gemini calls; run them side by side
+    main_future = sec09_future = sec11_future = None
     if SUMMARIZE_PROVIDER in ["ALL", "GEMINI"]:
         # 1. Main Extraction (WisdomTree + CME Vol)
-        main_pdfs = {k: v for k, v in pdf_paths.items() if k in ['wisdomtree', 'cme_sec01']}
-        extracted_metrics = extract_metrics_gemini(main_pdfs)
+        main_pdfs = {k: v for k, v in gemini_files.items() if k in ['wisdomtree', 'cme_sec01']}
+        main_future = background.submit(extract_metrics_gemini, main_pdfs)
         
         # 2. Section 09 Extraction (CME Rates Curve)
-        sec09_pdf = {k: v for k, v in pdf_paths.items() if k == 'cme_sec09'}
+        sec09_pdf = {k: v for k, v in gemini_files.items() if k == 'cme_sec09'}
         if sec09_pdf:
             print("Extracting CME Section 09 (Rates Curve)...")
-            sec09_raw = extract_metrics_gemini(sec09_pdf, prompt_override=EXTRACTION_PROMPT_SEC09)
+            sec09_future = background.submit(extract_metrics_gemini, sec09_pdf, prompt_override=EXTRACTION_PROMPT_SEC09)
 
         # 3. Section 11 Extraction (Equity Index)
-        sec11_pdf = {k: v for k, v in pdf_paths.items() if k == 'cme_sec11'}
+        sec11_pdf = {k: v for k, v in gemini_files.items() if k == 'cme_sec11'}
         if sec11_pdf:
             print("Extracting CME Section 11 (Equity Index)...")
-            sec11_raw = extract_metrics_gemini(sec11_pdf, prompt_override=EXTRACTION_PROMPT_SEC11)
+            sec11_future = background.submit(extract_metrics_gemini, sec11_pdf, prompt_override=EXTRACTION_PROMPT_SEC11)
+
+    extracted_metrics = main_future.result() if main_future else {}
+    sec09_raw = sec09_future.result() if sec09_future else {}
+    sec11_raw = sec11_future.result() if sec11_future else {}
     
     # Process Curve Data
     cme_rates_curve = process_cme_sec09(sec09_raw)
     cme_equity_flows = process_cme_sec11(sec11_raw)
     
-    # Fetch Live Fallbacks (VIX)
-    live_metrics = fetch_live_data()
+    # Live Fallbacks (VIX), fetched in the background since the start of the run
+    live_metrics = live_future.result()
     if not live_metrics:
         print("Warning: Live data fetch (yfinance source) failed completely.")
     
@@ -882,51 +1269,69 @@ def main():
     # Event Context - Anchored to effective market date
     effective_date = live_metrics.get('sp500_current_date', today)
     event_context = get_event_context(effective_date)
-    print(f"Event Context (as of {effective_date}): {json.dumps(event_context, indent=2)}")
+    print(f"Event Context (as of {effective_date}): {dumps_pretty(event_context)}")
 
     # Generate Deterministic Verification Block
     verification_block = generate_verification_block(effective_date, extracted_metrics, ground_truth_context['cme_signals'], event_context)
 
     # Phase 2: Summarization
+    formatted_prompt = build_summary_prompt(ground_truth_context, event_context)
+    images = []
+    if images_future:
+        try:
+            images = images_future.result()
+        except Exception as e:
+            print(f"Error converting PDFs to images: {e}")
+    background.shutdown()
     
     if RUN_MODE.startswith("BENCHMARK"):
         print(f"--- RUNNING {RUN_MODE} MODE ---")
         summaries = {}
         
-        # 1. Run Gemini Native
-        try:
-            summaries[GEMINI_MODEL] = summarize_gemini(pdf_paths, ground_truth_context, event_context)
-        except Exception as e:
-            summaries[GEMINI_MODEL] = f"Failed: {e}"
+        # All models are independent remote calls: run Gemini native and every OpenRouter model at once,
+        # then collect in the original order (Gemini first) so the report layout is unchanged
+        with ThreadPoolExecutor(max_workers=len(BENCHMARK_MODELS) + 1) as executor:
+            # 1. Run Gemini Native
+            gemini_future = executor.submit(summarize_gemini, gemini_files, formatted_prompt)
+
+            # 2. Run OpenRouter Benchmark Models
+            model_futures = {}
+            for model in BENCHMARK_MODELS:
+                print(f"Running {model}...")
+                # We re-use summarize_openrouter but override the model
+                model_futures[model] = executor.submit(summarize_openrouter, images, formatted_prompt, model_override=model)
 
-        # 2. Run OpenRouter Benchmark Models
-        for model in BENCHMARK_MODELS:
-            print(f"Running {model}...")
-            # We re-use summarize_openrouter but override the model
-            summaries[model] = summarize_openrouter(pdf_paths, ground_truth_context, event_context, model_override=model)
+            try:
+                summaries[GEMINI_SUMMARY_MODEL] = gemini_future.result()
+            except Exception as e:
+                summaries[GEMINI_SUMMARY_MODEL] = f"Failed: {e}"
+            for model, future in model_futures.items():
+                summaries[model] = future.result()
             
         # Save Report
         target_file = "benchmark_data.html" if RUN_MODE == "BENCHMARK_JSON" else "benchmark.html"
-        generate_benchmark_html(today, summaries, ground_truth=ground_truth_context, event_context=event_context, filename=target_file)
+        generate_benchmark_html(today, summaries, ground_truth=ground_truth_context, event_context=event_context, filename=target_file, now=now)
         
     else:
         # PRODUCTION MODE
         summary_or = "OpenRouter summary skipped."
         summary_gemini = "Gemini summary skipped."
 
-        if SUMMARIZE_PROVIDER in ["ALL", "OPENROUTER"]:
-            summary_or = summarize_openrouter(pdf_paths, ground_truth_context, event_context)
-            summary_or = clean_llm_output(summary_or, ground_truth_context.get('cme_signals'))
+        # Providers are independent remote calls; run them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            or_future = None
+            gemini_future = None
+            if SUMMARIZE_PROVIDER in ["ALL", "OPENROUTER"]:
+                or_future = executor.submit(summarize_openrouter, images, formatted_prompt)
+            if SUMMARIZE_PROVIDER in ["ALL", "GEMINI"]:
+                gemini_future = executor.submit(summarize_gemini, gemini_files, formatted_prompt)
 
-        if SUMMARIZE_PROVIDER in ["ALL", "GEMINI"]:
-            summary_gemini = summarize_gemini(pdf_paths, ground_truth_context, event_context)
-            summary_gemini = clean_llm_output(summary_gemini, ground_truth_context.get('cme_signals'))
-        
-        # Save & Report
-        os.makedirs("summaries", exist_ok=True)
-        generate_html(today, summary_or, summary_gemini, algo_scores, score_details, extracted_metrics, ground_truth_context.get('cme_signals'), verification_block, event_context, cme_rates_curve, cme_equity_flows)
+            if or_future:
+                summary_or = clean_llm_output(or_future.result(), ground_truth_context.get('cme_signals'))
+            if gemini_future:
+                summary_gemini = clean_llm_output(gemini_future.result(), ground_truth_context.get('cme_signals'))
         
-        # Email (Production Only)
+        # Email (Production Only) - sent on a background thread while the HTML report is written
         repo_name = GITHUB_REPOSITORY.split("/")[-1]
         owner_name = GITHUB_REPOSITORY.split("/")[0]
         pages_url = f"https://{owner_name}.github.io/{repo_name}/"
@@ -936,8 +1341,31 @@ def main():
             "event_context": event_context
         }
         
-        email_body = f"Check the attached report for today's summary.\n\nAudit Data: {json.dumps(full_audit_data, indent=2)}"
-        send_email(f"Daily Macro Summary - {today}", email_body, pages_url)
+        # Same-day rerun with identical content: keep the existing report and don't email it twice
+        report_hash = llm_cache_key("report", today, summary_or, summary_gemini, verification_block, dumps_canonical(full_audit_data))
+        last_report = load_report_state()
+        unchanged = last_report.get("hash") == report_hash
+        already_emailed = unchanged and last_report.get("emailed", False)
+
+        email_body = f"Check the attached report for today's summary.\n\nAudit Data: {dumps_pretty(full_audit_data)}"
+        email_executor = ThreadPoolExecutor(max_workers=1)
+        email_future = None
+        if already_emailed:
+            print("Report unchanged since last run and already emailed. Skipping email.")
+        else:
+            email_future = email_executor.submit(send_email, f"Daily Macro Summary - {today}", email_body, pages_url)
+
+        # Save & Report
+        os.makedirs("summaries", exist_ok=True)
+        if unchanged and os.path.exists("summaries/index.html"):
+            print("Report unchanged since last run. Keeping existing summaries/index.html.")
+        else:
+            generate_html(today, summary_or, summary_gemini, algo_scores, score_details, extracted_metrics, ground_truth_context.get('cme_signals'), verification_block, event_context, cme_rates_curve, cme_equity_flows, now=now)
+
+        # send_email handles its own errors; wait so the process doesn't exit mid-send
+        emailed = email_future.result() if email_future else already_emailed
+        email_executor.shutdown()
+        save_report_state({"hash": report_hash, "emailed": emailed})
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,8 @@
 # --- Prompts ---
 
+# Separates the static instructions (cacheable prefix) from the per-run data tail
+PROMPT_DATA_MARKER = "# === INPUT DATA ==="
+
 EXTRACTION_PROMPT = """
 You are a precision data extractor. Your job is to read the attached PDF pages (Financial Dashboard + CME Reports) and extract specific numerical data into valid JSON.
 
@@ -279,15 +282,9 @@ INPUTS PROVIDED (Vision):
    - **Section 09:** Interest Rate Futures (Yield Curve positioning).
    - **Section 11:** Equity Index Futures (S&P, Nasdaq, Dow flows).
 
-CRITICAL: You have been provided with PRE-CALCULATED Ground Truth Scores, raw Extracted Metrics, and deterministic Signal Labels below.
+CRITICAL: You have been provided with PRE-CALCULATED Ground Truth Scores, raw Extracted Metrics, and deterministic Signal Labels in the INPUT DATA block supplied after the documents.
 You MUST use these exact scores and signals. Do NOT attempt to recalculate them.
 
-Ground Truth & Extracted Metrics (Use these values exactly):
-{ground_truth_json}
-
-EVENT CONTEXT (Deterministic Flags):
-{event_context_json}
-
 # === BLOCK 0: EVENT RISK GATES ===
 
 *   **IF "TRIPLE_WITCHING" or "MONTHLY_OPEX" is present (Today or Recent):**
@@ -334,7 +331,7 @@ Do NOT include any verification data, raw metrics, or event flags in your output
 
 ### 1. The Dashboard (Scoreboard) [SECTION:DASHBOARD]
 
-Create a table with these 6 Dials. USE THE PRE-CALCULATED SCORES PROVIDED ABOVE.
+Create a table with these 6 Dials. USE THE PRE-CALCULATED SCORES FROM THE INPUT DATA BLOCK SUPPLIED AFTER THE DOCUMENTS.
 *In the 'Justification' column, reference the visual evidence from the CME images (Volume/OI) to support the score.*
 
 **Constraint:** You must ONLY cite numbers present in the `extracted_metrics` JSON. Do NOT "discover" or hallucinate numbers from the PDF text layer unless they are explicitly in the Ground Truth.
@@ -382,4 +379,12 @@ Create a table with these 6 Dials. USE THE PRE-CALCULATED SCORES PROVIDED ABOVE.
 
 ### 8. Conclusion & Trade Tilt [SECTION:CONCLUSION]
 [Cross-Asset Confirmation, Risk Rating, The Trade, Triggers]
+
+# === INPUT DATA ===
+
+Ground Truth & Extracted Metrics (Use these values exactly):
+{ground_truth_json}
+
+EVENT CONTEXT (Deterministic Flags):
+{event_context_json}
 """
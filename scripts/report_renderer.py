@@ -1,12 +1,23 @@
 import os
 import json
 import re
-import markdown
+import string
+import functools
 from datetime import datetime
-from config import PDF_SOURCES, GEMINI_MODEL, OPENROUTER_MODEL
+from config import PDF_SOURCES, GEMINI_SUMMARY_MODEL, OPENROUTER_MODEL
 
 # --- HTML Rendering Helpers ---
 
+# One converter for every summary: extensions are loaded once, reset() clears per-document state.
+# Built on first use so importing the renderer (e.g. in page-render workers) stays light.
+@functools.lru_cache(maxsize=1)
+def get_markdown_converter():
+    import markdown
+    return markdown.Markdown(extensions=['tables'])
+
+def render_markdown(text):
+    return get_markdown_converter().reset().convert(text)
+
 def render_chip(label, val, tooltip=""):
     c = 'badge-gray'
     v_lower = str(val).lower()
@@ -34,18 +45,23 @@ def get_curve_color(net_chg):
     if net_chg < 0: return "color: #e74c3c;"
     return "color: #7f8c8d;"
 
+# Category -> (color when score <= 4, color when score >= 7)
+SCORE_COLORS = {
+    # High = risk
+    "Inflation Pressure": ("#27ae60", "#e74c3c"),
+    "Credit Stress": ("#27ae60", "#e74c3c"),
+    "Valuation Risk": ("#27ae60", "#e74c3c"),
+    # High = strength
+    "Growth Impulse": ("#e74c3c", "#27ae60"),
+    "Liquidity Conditions": ("#e74c3c", "#27ae60"),
+    "Risk Appetite": ("#e74c3c", "#27ae60"),
+}
+
 def get_score_color(category, score):
-    high_risk_categories = ["Inflation Pressure", "Credit Stress", "Valuation Risk"]
-    high_good_categories = ["Growth Impulse", "Liquidity Conditions", "Risk Appetite"]
-    
-    if category in high_risk_categories:
-        if score >= 7: return "#e74c3c" # Red (High Risk)
-        if score <= 4: return "#27ae60" # Green (Safe)
-        
-    if category in high_good_categories:
-        if score >= 7: return "#27ae60" # Green (Strong)
-        if score <= 4: return "#e74c3c" # Red (Weak)
-        
+    colors = SCORE_COLORS.get(category)
+    if colors:
+        if score >= 7: return colors[1]
+        if score <= 4: return colors[0]
     return "#2c3e50" 
 
 def render_provenance_strip(extracted_metrics, cme_signals):
@@ -83,11 +99,11 @@ def render_key_numbers(extracted_metrics):
         ("CME Vol", fmt_num(kn.get('cme_total_volume')), "Total Volume across CME Exchange")
     ]
     
-    html = "<div class='key-numbers'>"
+    parts = ["<div class='key-numbers'>"]
     for label, val, tooltip in key_numbers_items:
-        html += f"<div class='key-number-item' title='{tooltip}' style='cursor: help;'><span class='key-number-label'>{label}</span><span class='key-number-value numeric'>{val}</span></div>"
-    html += "</div>"
-    return html
+        parts.append(f"<div class='key-number-item' title='{tooltip}' style='cursor: help;'><span class='key-number-label'>{label}</span><span class='key-number-value numeric'>{val}</span></div>")
+    parts.append("</div>")
+    return "".join(parts)
 
 def render_rates_curve_panel(rates_curve):
     if not rates_curve or not rates_curve.get("clusters"): return ""
@@ -103,16 +119,17 @@ def render_rates_curve_panel(rates_curve):
         "Long End": "30-Year & Ultra Bond (Inflation/Growth Proxy)"
     }
 
-    rows = ""
+    row_parts = []
     for name in ["Short End", "Belly", "Tens", "Long End"]:
         data = clusters.get(name, {})
         net = data.get("net_oi_change", 0)
-        rows += f"""
+        row_parts.append(f"""
         <div class="curve-item" title="{cluster_defs.get(name, '')}">
             <span class="curve-label" style="border-bottom: 1px dotted #ccc; cursor: help;">{name}</span>
             <span class="curve-value" style="{get_curve_color(net)}">{fmt_delta(net)}</span>
         </div>
-        """
+        """)
+    rows = "".join(row_parts)
     
     # Tenor Detail Table
     tenors_data = rates_curve.get("tenors", {})
@@ -125,19 +142,20 @@ def render_rates_curve_panel(rates_curve):
     }
     active_tenors = cluster_map.get(active_cluster_name, [])
 
-    tenor_rows = ""
+    tenor_parts = []
     for tenor in ["2y", "3y", "5y", "10y", "tn", "30y", "ultra"]:
         t_data = tenors_data.get(tenor, {})
         is_active = tenor in active_tenors
         row_class = "active-tenor-row" if is_active else ""
         
-        tenor_rows += f"""
+        tenor_parts.append(f"""
         <tr class="{row_class}">
             <td style="text-align: left; padding: 4px 8px;">{tenor.upper()}</td>
             <td class="numeric" style="padding: 4px 8px;">{fmt_num(t_data.get('total_volume', 0))}</td>
             <td class="numeric" style="padding: 4px 8px; {get_curve_color(t_data.get('oi_change', 0))}">{fmt_delta(t_data.get('oi_change', 0))}</td>
         </tr>
-        """
+        """)
+    tenor_rows = "".join(tenor_parts)
 
     return f"""
     <div class="rates-curve-panel">
@@ -233,7 +251,7 @@ def render_equity_flows_panel(equity_data):
         ("sml", "SML 600", "#7f8c8d")
     ]
     
-    rows = ""
+    row_parts = []
     for key, label, color in display_order:
         p = products.get(key)
         if not p: continue
@@ -242,7 +260,7 @@ def render_equity_flows_panel(equity_data):
         oi_chg = p.get("oi_change", 0)
         oi_color = "#27ae60" if oi_chg > 0 else "#e74c3c" if oi_chg < 0 else "#7f8c8d"
         
-        rows += f"""
+        row_parts.append(f"""
         <div class="equity-row" style="display: flex; justify-content: space-between; padding: 6px 0; font-size: 0.9em;">
             <div style="font-weight: 600; color: {color};">{label}</div>
             <div style="display: flex; gap: 15px;">
@@ -250,7 +268,8 @@ def render_equity_flows_panel(equity_data):
                 <span title="Open Interest Change" style="font-weight: bold; color: {oi_color}; min-width: 60px; text-align: right;">{fmt_delta(oi_chg)}</span>
             </div>
         </div>
-        """
+        """)
+    rows = "".join(row_parts)
         
     return f"""
     <div class="rates-curve-panel">
@@ -266,7 +285,7 @@ def render_equity_flows_panel(equity_data):
 
 def render_algo_box(scores, details, cme_signals):
     # Scoreboard
-    score_html = "<div class='score-grid'>"
+    score_parts = ["<div class='score-grid'>"]
     
     # Enforce consistent display order matching the LLM prompt
     score_order = [
@@ -286,30 +305,32 @@ def render_algo_box(scores, details, cme_signals):
         if "Default" in detail_text or "Error" in detail_text:
             status_icon = f"<span title='{detail_text}' style='cursor: help;'>&#9888;&#65039;</span>"
 
-        score_html += f"""
+        score_parts.append(f"""
         <div class='score-card' style='border-left: 5px solid {color};'>
             <div class='score-label'><span>{k}</span>{status_icon}</div>
             <div class='score-value' style='color: {color};'>{v}/10</div>
-        </div>"""
-    score_html += "</div>"
+        </div>""")
+    score_parts.append("</div>")
+    score_html = "".join(score_parts)
 
     # Signals
     sig_html = ""
     if cme_signals:
-        sig_html = "<div class='score-grid' style='margin-top: 20px; border-top: 2px dashed #eee; padding-top: 20px; border-left: none;'>"
+        sig_parts = ["<div class='score-grid' style='margin-top: 20px; border-top: 2px dashed #eee; padding-top: 20px; border-left: none;'>"]
         for label, data in cme_signals.items():
             quality = data.get('signal_label', 'Unknown')
             reason = data.get('gate_reason', '')
             allowed = "Allowed" if data.get('direction_allowed') else "Redacted"
             color = "#27ae60" if data.get('direction_allowed') else "#7f8c8d"
             
-            sig_html += f"""
+            sig_parts.append(f"""
             <div style='background: white; padding: 15px; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); text-align: center; border-left: 5px solid {color};' title='{reason}'>
                 <span class='key-number-label'>{label.upper()} SIGNAL</span><br>
                 <span class='key-number-value' style='color: {color};'>{quality}</span><br>
                 <small style='font-size:0.7em; color:#999;'>{allowed}</small>
-            </div>"""
-        sig_html += "</div>"
+            </div>""")
+        sig_parts.append("</div>")
+        sig_html = "".join(sig_parts)
         
     return f"""
     <div class="algo-box">
@@ -334,20 +355,21 @@ def render_algo_box(scores, details, cme_signals):
     </div>
     """
 
+# Dial keys must match extracted metrics keys
+SCORE_DIALS = [
+    "Growth Impulse", "Inflation Pressure", "Liquidity Conditions", 
+    "Credit Stress", "Valuation Risk", "Risk Appetite"
+]
+
+# Regex to capture the Dial Name cell and the Score cell
+# Markdown tables render as <tr><td>Dial</td><td>Score</td>...</tr>
+# We use a pattern that matches the first two columns.
+SCORE_CELL_PATTERN = re.compile(r"(<td>\s*(" + "|".join(SCORE_DIALS) + r")\s*</td>\s*<td>\s*)([^<]+)(\s*</td>)", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"[\d\.]+")
+
 def inject_score_deltas(html_content, ground_truth_scores):
     if not ground_truth_scores: return html_content
     
-    # Dial keys must match extracted metrics keys
-    dials = [
-        "Growth Impulse", "Inflation Pressure", "Liquidity Conditions", 
-        "Credit Stress", "Valuation Risk", "Risk Appetite"
-    ]
-    
-    # Regex to capture the Dial Name cell and the Score cell
-    # Markdown tables render as <tr><td>Dial</td><td>Score</td>...</tr>
-    # We use a pattern that matches the first two columns.
-    pattern = r"(<td>\s*(" + "|".join(dials) + r")\s*</td>\s*<td>\s*)([^<]+)(\s*</td>)"
-    
     def replacer(match):
         prefix = match.group(1)
         dial_name = match.group(2)
@@ -356,7 +378,7 @@ def inject_score_deltas(html_content, ground_truth_scores):
         
         try:
             # Extract first float
-            nums = re.findall(r"[\d\.]+", score_text)
+            nums = NUMBER_PATTERN.findall(score_text)
             if not nums: return match.group(0)
             
             llm_score = float(nums[0])
@@ -377,75 +399,11 @@ def inject_score_deltas(html_content, ground_truth_scores):
             
         return match.group(0)
 
-    return re.sub(pattern, replacer, html_content, flags=re.IGNORECASE)
-
-def generate_benchmark_html(today, summaries, ground_truth=None, event_context=None, filename="benchmark.html"):
-    print(f"Generating Benchmark HTML report ({filename})...")
-    
-    # Extract Context
-    extracted_metrics = ground_truth.get('extracted_metrics', {}) if ground_truth else {}
-    cme_signals = ground_truth.get('cme_signals', {}) if ground_truth else {}
-    rates_curve = ground_truth.get('cme_rates_curve', {}) if ground_truth else {}
-    equity_flows = ground_truth.get('cme_equity_flows', {}) if ground_truth else {}
-    scores = ground_truth.get('calculated_scores', {}) if ground_truth else {}
-    score_details = ground_truth.get('score_details', {}) if ground_truth else {}
-
-    # Badges Logic
-    generated_time = datetime.now().strftime('%Y-%m-%d %H:%M UTC')
-    wt_date = extracted_metrics.get('wisdomtree_as_of_date', 'Unknown')
-    cme_date = extracted_metrics.get('cme_bulletin_date', 'Unknown')
-    mode_label = 'JSON (extracted by Gemini)' if 'data' in filename else 'Visual (PDFs)'
-
-    # Render Header Components
-    header_html = ""
-    header_html += render_provenance_strip(extracted_metrics, cme_signals)
-    
-    # PDF Links
-    header_html += f"""
-        <div style="text-align: center; margin-bottom: 15px; color: #7f8c8d; font-size: 0.9em; font-style: italic;">
-            Independently generated summary. Informational use only—NOT financial advice. Full disclaimers in footer.
-        </div>
-        <div class="pdf-link">
-            <h3>Inputs</h3>
-            <a href="{PDF_SOURCES['wisdomtree']}" target="_blank">📄 View WisdomTree PDF</a>
-            &nbsp;&nbsp;
-            <a href="https://www.cmegroup.com/market-data/daily-bulletin.html" target="_blank" style="background-color: #2c3e50;">📊 View CME Bulletin</a>
-        </div>
-    """
-    
-    # Event Callout
-    header_html += render_event_callout(event_context, rates_curve)
-
-    header_html += render_key_numbers(extracted_metrics)
-    
-    # Render Visual Panels
-    rates_html = render_rates_curve_panel(rates_curve)
-    equity_flows_html = render_equity_flows_panel(equity_flows)
-    
-    # Render Algo Box (Ground Truth)
-    algo_html = render_algo_box(scores, score_details, cme_signals)
+    return SCORE_CELL_PATTERN.sub(replacer, html_content)
 
-    options = ""
-    divs = ""
-    
-    # Sort models: Gemini Native first, then others
-    sorted_models = [GEMINI_MODEL] + [m for m in summaries.keys() if m != GEMINI_MODEL]
-    
-    for i, model in enumerate(sorted_models):
-        content = summaries.get(model, "No content")
-        html_content = markdown.markdown(content, extensions=['tables'])
-        
-        # Inject Score Deltas (LLM vs Ground Truth)
-        html_content = inject_score_deltas(html_content, scores)
-        
-        display_style = "block" if i == 0 else "none"
-        is_selected = "selected" if i == 0 else ""
-        
-        options += f'<option value="{model}" {is_selected}>{model}</option>'
-        divs += f'<div id="{model}" class="model-content" style="display: {display_style};">{html_content}</div>'
+# --- Report Templates ---
 
-    # ... CSS ...
-    css = """
+BENCHMARK_CSS = """
     body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; line-height: 1.6; color: #333; max-width: 1200px; margin: 0 auto; padding: 20px; background: #f4f6f8; }
     h1 { text-align: center; color: #2c3e50; }
     .controls { text-align: center; margin-bottom: 30px; background: white; padding: 15px; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); position: sticky; top: 10px; z-index: 900; border: 1px solid #ddd; }
@@ -520,8 +478,8 @@ def generate_benchmark_html(today, summaries, ground_truth=None, event_context=N
         .vol-label { color: #8b949e !important; }
     }
     """
-    
-    script = """
+
+BENCHMARK_SCRIPT = """
     function showModel(modelId) {
         // Hide all
         const contents = document.getElementsByClassName('model-content');
@@ -544,41 +502,41 @@ def generate_benchmark_html(today, summaries, ground_truth=None, event_context=N
         });
     });
     """
-    
-    html = f"""
+
+BENCHMARK_HTML_TEMPLATE = string.Template("""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Benchmark Arena: Daily Macro Summary - {today}</title>
-        <style>{css}</style>
-        <script>{script}</script>
+        <title>Benchmark Arena: Daily Macro Summary - ${today}</title>
+        <style>${css}</style>
+        <script>${script}</script>
     </head>
     <body>
-        <h1>Benchmark Arena: Daily Macro Summary ({today})</h1>
+        <h1>Benchmark Arena: Daily Macro Summary (${today})</h1>
         
         <div style="display: flex; justify-content: center; gap: 15px; margin-bottom: 20px;">
-            <span class="badge badge-gray timestamp-badge" data-utc="{generated_time}">Generated: {generated_time}</span>
-            <span class="badge badge-blue">Data as of: WT: {wt_date} / CME: {cme_date}</span>
+            <span class="badge badge-gray timestamp-badge" data-utc="${generated_time}">Generated: ${generated_time}</span>
+            <span class="badge badge-blue">Data as of: WT: ${wt_date} / CME: ${cme_date}</span>
         </div>
         
-        <p style="text-align:center; color:#666; margin-top: -10px;">Mode: {mode_label}</p>
+        <p style="text-align:center; color:#666; margin-top: -10px;">Mode: ${mode_label}</p>
         
-        {header_html}
-        {rates_html}
-        {equity_flows_html}
+        ${header_html}
+        ${rates_html}
+        ${equity_flows_html}
         
         <div class="controls">
             <label for="model-select"><strong>Select Model:</strong></label>
             <select id="model-select" onchange="showModel(this.value)">
-                {options}
+                ${options}
             </select>
         </div>
         
-        {divs}
+        ${divs}
         
-        {algo_html}
+        ${algo_html}
         
         <div class="footer">
             <div style="margin-bottom: 20px;">
@@ -589,65 +547,13 @@ def generate_benchmark_html(today, summaries, ground_truth=None, event_context=N
                 <br><strong>This content is for informational purposes only and is NOT financial advice.</strong> No fiduciary or advisor-client relationship is formed. This is not an offer or solicitation to buy or sell any security. Trading involves significant risk of loss.
                 <br>Use at your own risk; the author disclaims liability for any losses or decisions made based on this content. Consult a qualified financial professional. Past performance is not indicative of future results. Automated extraction and AI analysis may contain errors or misinterpretations.
             </div>
-            Generated on {generated_time}
+            Generated on ${generated_time}
         </div>
     </body>
     </html>
-    """
-    
-    # Save to specific filename
-    os.makedirs("summaries", exist_ok=True)
-    with open(f"summaries/{filename}", "w", encoding="utf-8") as f:
-        f.write(html)
-    print(f"HTML report generated and saved to summaries/{filename}")
+    """)
 
-def generate_html(today, summary_or, summary_gemini, scores, details, extracted_metrics, cme_signals=None, verification_block="", event_context=None, rates_curve=None, equity_flows=None):
-    print("Generating HTML report...")
-    
-    # Prepend Verification Block to the raw text BEFORE markdown conversion
-    if verification_block:
-        summary_or = verification_block + "\n\n" + summary_or
-        summary_gemini = verification_block + "\n\n" + summary_gemini
-
-    # Note: Summaries should be cleaned before passing here
-    
-    html_or = markdown.markdown(summary_or, extensions=['tables'])
-    html_gemini = markdown.markdown(summary_gemini, extensions=['tables'])
-    
-    # Render Components using Helpers
-    provenance_html = render_provenance_strip(extracted_metrics, cme_signals)
-    kn_html = render_key_numbers(extracted_metrics)
-    signals_panel_html = render_signals_panel(cme_signals)
-    rates_curve_html = render_rates_curve_panel(rates_curve)
-    equity_flows_html = render_equity_flows_panel(equity_flows)
-    algo_box_html = render_algo_box(scores, details, cme_signals)
-    event_callout_html = render_event_callout(event_context, rates_curve)
-
-    # Build columns conditionally
-    columns_html = ""
-    if "Gemini summary skipped" not in summary_gemini:
-        columns_html += f"""
-            <div class="column">
-                <h2>&#129302; Gemini ({GEMINI_MODEL})</h2>
-                {signals_panel_html}
-                {rates_curve_html}
-                {equity_flows_html}
-                {html_gemini}
-            </div>
-        """
-    
-    if "OpenRouter summary skipped" not in summary_or:
-        columns_html += f"""
-            <div class="column">
-                <h2>&#129504; OpenRouter ({OPENROUTER_MODEL})</h2>
-                {signals_panel_html}
-                {rates_curve_html}
-                {equity_flows_html}
-                {html_or}
-            </div>
-        """
-
-    css = """
+REPORT_CSS = """
     body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; line-height: 1.6; color: #333; max-width: 1200px; margin: 0 auto; padding: 20px; background: #f4f6f8; transition: background 0.3s, color 0.3s; }
     h1 { text-align: center; color: #2c3e50; margin-bottom: 20px; }
     .pdf-link { display: block; text-align: center; margin-bottom: 20px; }
@@ -757,7 +663,216 @@ def generate_html(today, summary_or, summary_gemini, scores, details, extracted_
         .vol-label { color: #8b949e !important; }
     }
     """
+
+REPORT_SCRIPT = """
+    document.addEventListener("DOMContentLoaded", function() {
+        const badges = document.querySelectorAll(".timestamp-badge");
+        badges.forEach(b => {
+            const utc = b.getAttribute("data-utc");
+            if (utc) {
+                const date = new Date(utc.replace(" UTC", "Z").replace(" ", "T"));
+                b.textContent = "Generated: " + date.toLocaleString();
+            }
+        });
+    });
+    """
+
+REPORT_HTML_TEMPLATE = string.Template("""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Daily Macro Summary - ${today}</title>
+        <style>${css}</style>
+        <script>${script}</script>
+    </head>
+    <body>
+        <h1>Daily Macro Summary (${today})</h1>
+        
+        <div style="display: flex; justify-content: center; gap: 15px; margin-bottom: 20px;">
+            <span class="badge badge-gray timestamp-badge" data-utc="${generated_time}">Generated: ${generated_time}</span>
+            <span class="badge badge-blue">Data as of: WT: ${display_wt_date} / CME: ${display_cme_date}</span>
+        </div>
+        
+        ${provenance_html}
+
+        <div style="text-align: center; margin-bottom: 15px; color: #7f8c8d; font-size: 0.9em; font-style: italic;">
+            Independently generated summary. Informational use only&mdash;NOT financial advice. Full disclaimers in footer.
+        </div>
+        <div class="pdf-link">
+            <h3>Inputs</h3>
+            <a href="${main_pdf_url}" target="_blank">📄 View WisdomTree PDF</a>
+            &nbsp;&nbsp;
+            <a href="${cme_bulletin_url}" target="_blank" style="background-color: #2c3e50;">📊 View CME Bulletin${cme_warning_flag}</a>
+        </div>
+
+        ${event_callout_html}
+        ${kn_html}
+
+        <div class="layout-wrapper">
+            <div class="toc-sidebar">
+                <h3>Contents</h3>
+                <a href="#scoreboard">1. Scoreboard</a>
+                <a href="#takeaway">2. Executive Takeaway</a>
+                <a href="#fiscal">3. Fiscal Dominance</a>
+                <a href="#rates">4. Rates & Curve</a>
+                <a href="#credit">5. Credit Stress</a>
+                <a href="#engine">6. Engine Room</a>
+                <a href="#valuation">7. Valuation</a>
+                <a href="#conclusion">8. Conclusion</a>
+            </div>
+            
+            <div class="container">
+                ${columns_html}
+            </div>
+        </div>
+
+        ${algo_box_html}
+
+        ${glossary_html}
+
+        <div class="footer">
+            <div style="margin-bottom: 20px;">
+                <a href="https://github.com/jpeirce/daily-macro-summary" style="color: #3498db; text-decoration: none; font-weight: bold;">View Source Code on GitHub</a>
+            </div>
+            <div style="margin-bottom: 20px; color: #7f8c8d; font-size: 0.85em; font-style: italic; line-height: 1.4; border-top: 1px solid #eee; padding-top: 20px;">
+                This is an independently generated summary of the publicly available WisdomTree Daily Dashboard and CME Data. Not affiliated with, reviewed by, or approved by WisdomTree or CME Group. Third-party sources are not responsible for the accuracy of this summary. No warranties are made regarding completeness, accuracy, or timeliness; data may be delayed or incorrect.
+                <br><strong>This content is for informational purposes only and is NOT financial advice.</strong> No fiduciary or advisor-client relationship is formed. This is not an offer or solicitation to buy or sell any security. Trading involves significant risk of loss.
+                <br>Use at your own risk; the author disclaims liability for any losses or decisions made based on this content. Consult a qualified financial professional. Past performance is not indicative of future results. Automated extraction and AI analysis may contain errors or misinterpretations.
+            </div>
+            Generated on ${generated_time}
+        </div>
+    </body>
+    </html>
+    """)
+
+def generate_benchmark_html(today, summaries, ground_truth=None, event_context=None, filename="benchmark.html", now=None):
+    print(f"Generating Benchmark HTML report ({filename})...")
+    
+    # Extract Context
+    extracted_metrics = ground_truth.get('extracted_metrics', {}) if ground_truth else {}
+    cme_signals = ground_truth.get('cme_signals', {}) if ground_truth else {}
+    rates_curve = ground_truth.get('cme_rates_curve', {}) if ground_truth else {}
+    equity_flows = ground_truth.get('cme_equity_flows', {}) if ground_truth else {}
+    scores = ground_truth.get('calculated_scores', {}) if ground_truth else {}
+    score_details = ground_truth.get('score_details', {}) if ground_truth else {}
+
+    # Badges Logic
+    generated_time = (now or datetime.now()).strftime('%Y-%m-%d %H:%M UTC')
+    wt_date = extracted_metrics.get('wisdomtree_as_of_date', 'Unknown')
+    cme_date = extracted_metrics.get('cme_bulletin_date', 'Unknown')
+    mode_label = 'JSON (extracted by Gemini)' if 'data' in filename else 'Visual (PDFs)'
+
+    # Render Header Components
+    header_html = ""
+    header_html += render_provenance_strip(extracted_metrics, cme_signals)
+    
+    # PDF Links
+    header_html += f"""
+        <div style="text-align: center; margin-bottom: 15px; color: #7f8c8d; font-size: 0.9em; font-style: italic;">
+            Independently generated summary. Informational use only—NOT financial advice. Full disclaimers in footer.
+        </div>
+        <div class="pdf-link">
+            <h3>Inputs</h3>
+            <a href="{PDF_SOURCES['wisdomtree']}" target="_blank">📄 View WisdomTree PDF</a>
+            &nbsp;&nbsp;
+            <a href="https://www.cmegroup.com/market-data/daily-bulletin.html" target="_blank" style="background-color: #2c3e50;">📊 View CME Bulletin</a>
+        </div>
+    """
+    
+    # Event Callout
+    header_html += render_event_callout(event_context, rates_curve)
+
+    header_html += render_key_numbers(extracted_metrics)
+    
+    # Render Visual Panels
+    rates_html = render_rates_curve_panel(rates_curve)
+    equity_flows_html = render_equity_flows_panel(equity_flows)
+    
+    # Render Algo Box (Ground Truth)
+    algo_html = render_algo_box(scores, score_details, cme_signals)
+
+    option_parts = []
+    div_parts = []
     
+    # Sort models: Gemini Native first, then others
+    sorted_models = [GEMINI_SUMMARY_MODEL] + [m for m in summaries.keys() if m != GEMINI_SUMMARY_MODEL]
+    
+    for i, model in enumerate(sorted_models):
+        content = summaries.get(model, "No content")
+        html_content = render_markdown(content)
+        
+        # Inject Score Deltas (LLM vs Ground Truth)
+        html_content = inject_score_deltas(html_content, scores)
+        
+        display_style = "block" if i == 0 else "none"
+        is_selected = "selected" if i == 0 else ""
+        
+        option_parts.append(f'<option value="{model}" {is_selected}>{model}</option>')
+        div_parts.append(f'<div id="{model}" class="model-content" style="display: {display_style};">{html_content}</div>')
+    options = "".join(option_parts)
+    divs = "".join(div_parts)
+
+    html = BENCHMARK_HTML_TEMPLATE.substitute(
+        today=today, css=BENCHMARK_CSS, script=BENCHMARK_SCRIPT, generated_time=generated_time,
+        wt_date=wt_date, cme_date=cme_date, mode_label=mode_label,
+        header_html=header_html, rates_html=rates_html, equity_flows_html=equity_flows_html,
+        options=options, divs=divs, algo_html=algo_html
+    )
+    
+    # Save to specific filename
+    os.makedirs("summaries", exist_ok=True)
+    with open(f"summaries/{filename}", "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"HTML report generated and saved to summaries/{filename}")
+
+def generate_html(today, summary_or, summary_gemini, scores, details, extracted_metrics, cme_signals=None, verification_block="", event_context=None, rates_curve=None, equity_flows=None, now=None):
+    print("Generating HTML report...")
+    
+    # Prepend Verification Block to the raw text BEFORE markdown conversion
+    if verification_block:
+        summary_or = verification_block + "\n\n" + summary_or
+        summary_gemini = verification_block + "\n\n" + summary_gemini
+
+    # Note: Summaries should be cleaned before passing here
+    
+    html_or = render_markdown(summary_or)
+    html_gemini = render_markdown(summary_gemini)
+    
+    # Render Components using Helpers
+    provenance_html = render_provenance_strip(extracted_metrics, cme_signals)
+    kn_html = render_key_numbers(extracted_metrics)
+    signals_panel_html = render_signals_panel(cme_signals)
+    rates_curve_html = render_rates_curve_panel(rates_curve)
+    equity_flows_html = render_equity_flows_panel(equity_flows)
+    algo_box_html = render_algo_box(scores, details, cme_signals)
+    event_callout_html = render_event_callout(event_context, rates_curve)
+
+    # Build columns conditionally
+    columns_html = ""
+    if "Gemini summary skipped" not in summary_gemini:
+        columns_html += f"""
+            <div class="column">
+                <h2>&#129302; Gemini ({GEMINI_SUMMARY_MODEL})</h2>
+                {signals_panel_html}
+                {rates_curve_html}
+                {equity_flows_html}
+                {html_gemini}
+            </div>
+        """
+    
+    if "OpenRouter summary skipped" not in summary_or:
+        columns_html += f"""
+            <div class="column">
+                <h2>&#129504; OpenRouter ({OPENROUTER_MODEL})</h2>
+                {signals_panel_html}
+                {rates_curve_html}
+                {equity_flows_html}
+                {html_or}
+            </div>
+        """
+
     # We can add links to CME pdfs too if desired, but for now just Main
     main_pdf_url = PDF_SOURCES['wisdomtree']
     cme_bulletin_url = "https://www.cmegroup.com/market-data/daily-bulletin.html"
@@ -841,12 +956,13 @@ def generate_html(today, summary_or, summary_gemini, scores, details, extracted_
         ])
     ]
 
-    glossary_content = ""
+    glossary_parts = []
     for category, items in glossary_items:
-        glossary_content += f"<div style='margin-bottom: 15px;'><h4 style='margin-bottom:8px; border-bottom:1px solid #eee;'>{category}</h4>"
+        glossary_parts.append(f"<div style='margin-bottom: 15px;'><h4 style='margin-bottom:8px; border-bottom:1px solid #eee;'>{category}</h4>")
         for label, color, desc in items:
-            glossary_content += f"<div style='margin-bottom: 4px;'><span class='badge badge-{color}' style='min-width: 120px; width: auto; text-align: center; display: inline-block;'>{label}</span> <span style='font-size: 0.9em; color: #666;'>{desc}</span></div>"
-        glossary_content += "</div>"
+            glossary_parts.append(f"<div style='margin-bottom: 4px;'><span class='badge badge-{color}' style='min-width: 120px; width: auto; text-align: center; display: inline-block;'>{label}</span> <span style='font-size: 0.9em; color: #666;'>{desc}</span></div>")
+        glossary_parts.append("</div>")
+    glossary_content = "".join(glossary_parts)
 
     glossary_html = f"""
     <div class="algo-box" style="margin-top: 20px;">
@@ -859,90 +975,15 @@ def generate_html(today, summary_or, summary_gemini, scores, details, extracted_
     </div>
     """
 
-    generated_time = datetime.now().strftime('%Y-%m-%d %H:%M UTC')
-
-    script = """
-    document.addEventListener("DOMContentLoaded", function() {
-        const badges = document.querySelectorAll(".timestamp-badge");
-        badges.forEach(b => {
-            const utc = b.getAttribute("data-utc");
-            if (utc) {
-                const date = new Date(utc.replace(" UTC", "Z").replace(" ", "T"));
-                b.textContent = "Generated: " + date.toLocaleString();
-            }
-        });
-    });
-    """
+    generated_time = (now or datetime.now()).strftime('%Y-%m-%d %H:%M UTC')
 
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Daily Macro Summary - {today}</title>
-        <style>{css}</style>
-        <script>{script}</script>
-    </head>
-    <body>
-        <h1>Daily Macro Summary ({today})</h1>
-        
-        <div style="display: flex; justify-content: center; gap: 15px; margin-bottom: 20px;">
-            <span class="badge badge-gray timestamp-badge" data-utc="{generated_time}">Generated: {generated_time}</span>
-            <span class="badge badge-blue">Data as of: WT: {display_wt_date} / CME: {display_cme_date}</span>
-        </div>
-        
-        {provenance_html}
-
-        <div style="text-align: center; margin-bottom: 15px; color: #7f8c8d; font-size: 0.9em; font-style: italic;">
-            Independently generated summary. Informational use only&mdash;NOT financial advice. Full disclaimers in footer.
-        </div>
-        <div class="pdf-link">
-            <h3>Inputs</h3>
-            <a href="{main_pdf_url}" target="_blank">📄 View WisdomTree PDF</a>
-            &nbsp;&nbsp;
-            <a href="{cme_bulletin_url}" target="_blank" style="background-color: #2c3e50;">📊 View CME Bulletin{cme_warning_flag}</a>
-        </div>
-
-        {event_callout_html}
-        {kn_html}
-
-        <div class="layout-wrapper">
-            <div class="toc-sidebar">
-                <h3>Contents</h3>
-                <a href="#scoreboard">1. Scoreboard</a>
-                <a href="#takeaway">2. Executive Takeaway</a>
-                <a href="#fiscal">3. Fiscal Dominance</a>
-                <a href="#rates">4. Rates & Curve</a>
-                <a href="#credit">5. Credit Stress</a>
-                <a href="#engine">6. Engine Room</a>
-                <a href="#valuation">7. Valuation</a>
-                <a href="#conclusion">8. Conclusion</a>
-            </div>
-            
-            <div class="container">
-                {columns_html}
-            </div>
-        </div>
-
-        {algo_box_html}
-
-        {glossary_html}
-
-        <div class="footer">
-            <div style="margin-bottom: 20px;">
-                <a href="https://github.com/jpeirce/daily-macro-summary" style="color: #3498db; text-decoration: none; font-weight: bold;">View Source Code on GitHub</a>
-            </div>
-            <div style="margin-bottom: 20px; color: #7f8c8d; font-size: 0.85em; font-style: italic; line-height: 1.4; border-top: 1px solid #eee; padding-top: 20px;">
-                This is an independently generated summary of the publicly available WisdomTree Daily Dashboard and CME Data. Not affiliated with, reviewed by, or approved by WisdomTree or CME Group. Third-party sources are not responsible for the accuracy of this summary. No warranties are made regarding completeness, accuracy, or timeliness; data may be delayed or incorrect.
-                <br><strong>This content is for informational purposes only and is NOT financial advice.</strong> No fiduciary or advisor-client relationship is formed. This is not an offer or solicitation to buy or sell any security. Trading involves significant risk of loss.
-                <br>Use at your own risk; the author disclaims liability for any losses or decisions made based on this content. Consult a qualified financial professional. Past performance is not indicative of future results. Automated extraction and AI analysis may contain errors or misinterpretations.
-            </div>
-            Generated on {generated_time}
-        </div>
-    </body>
-    </html>
-    """
+    html_content = REPORT_HTML_TEMPLATE.substitute(
+        today=today, css=REPORT_CSS, script=REPORT_SCRIPT, generated_time=generated_time,
+        display_wt_date=display_wt_date, display_cme_date=display_cme_date,
+        provenance_html=provenance_html, main_pdf_url=main_pdf_url, cme_bulletin_url=cme_bulletin_url,
+        cme_warning_flag=cme_warning_flag, event_callout_html=event_callout_html, kn_html=kn_html,
+        columns_html=columns_html, algo_box_html=algo_box_html, glossary_html=glossary_html
+    )
     
     with open("summaries/index.html", "w", encoding="utf-8") as f:
         # Add hidden provenance data for reproducibility
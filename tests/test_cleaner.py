@@ -24,6 +24,16 @@ class TestCleaner(unittest.TestCase):
         # Should not append note if no banned words
         self.assertNotIn("Language normalization applied", clean_text)
 
+    def test_clean_fence_with_leading_whitespace(self):
+        md_text = "  \n```markdown  \n# Title\nContent\n```  \n"
+        clean_text = clean_llm_output(md_text)
+        self.assertEqual(clean_text, "# Title\nContent")
+
+    def test_clean_keeps_interior_fences(self):
+        md_text = "# Title\n```\ncode\n```\nAfter"
+        clean_text = clean_llm_output(md_text)
+        self.assertEqual(clean_text, md_text)
+
     def test_clean_institutions(self):
         text = "Institutions are adding shorts."
         clean_text = clean_llm_output(text)
@@ -49,6 +59,24 @@ class TestCleaner(unittest.TestCase):
         self.assertNotIn("allocators", clean_text)
         self.assertIn("market participants", clean_text)
 
+    def test_toc_anchors_and_sentinels(self):
+        text = "### 1. The Dashboard [SECTION:DASHBOARD]\n| a |\n### 4. Rates & Curve [SECTION:RATES]\nBody"
+        clean_text = clean_llm_output(text)
+        self.assertIn('<a id="scoreboard"></a>\n### 1. The Dashboard', clean_text)
+        self.assertIn('<a id="rates"></a>\n### 4. Rates & Curve', clean_text)
+        self.assertNotIn("[SECTION:", clean_text)
+
+    def test_signal_lines_overwritten_per_section(self):
+        text = ("### 4. Rates & Curve [SECTION:RATES]\n* Signal: Directional\n* Direction: Steepening\n"
+                "### 6. The Engine Room [SECTION:EQUITIES]\n* Signal: Hedging\n* Direction: Up")
+        signals = {
+            "rates": {"signal_label": "Unknown", "direction_allowed": False},
+            "equity": {"signal_label": "Directional", "direction_allowed": True},
+        }
+        clean_text = clean_llm_output(text, signals)
+        self.assertIn("* Signal: Unknown\n* Direction: Unknown", clean_text)
+        self.assertIn("* Signal: Directional\n* Direction: Up", clean_text)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import download_pdfs
+
+def fake_get(url, stream=False, timeout=None, headers=None):
+    if "broken" in url:
+        raise Exception("404 Not Found")
+    r = MagicMock()
+    r.__enter__.return_value = r
+    etag = '"' + url.rsplit("/", 1)[-1] + '"'
+    r.status_code = 304 if (headers or {}).get("If-None-Match") == etag else 200
+    r.headers = {"ETag": etag}
+    content = b"%PDF-1.4 " + url.encode()
+    r.iter_content.return_value = [content[:8], content[8:]]
+    return r
+
+class TestDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    @patch('fetch_and_summarize.SESSION.get', side_effect=fake_get)
+    def test_downloads_keep_source_order(self, mock_get):
+        sources = {
+            "wisdomtree": "https://example.com/wt.pdf",
+            "cme_sec01": "https://example.com/sec01.pdf",
+            "cme_sec09": "https://example.com/sec09.pdf",
+        }
+        paths = download_pdfs(sources)
+        self.assertEqual(list(paths.keys()), list(sources.keys()))
+        with open(paths["cme_sec09"], "rb") as f:
+            self.assertIn(b"sec09", f.read())
+
+    @patch('fetch_and_summarize.SESSION.get', side_effect=fake_get)
+    def test_failed_download_is_skipped(self, mock_get):
+        sources = {
+            "wisdomtree": "https://example.com/wt.pdf",
+            "cme_sec01": "https://example.com/broken.pdf",
+        }
+        paths = download_pdfs(sources)
+        self.assertEqual(paths, {"wisdomtree": "wisdomtree.pdf"})
+        self.assertFalse(os.path.exists("cme_sec01.pdf.part"))
+
+    @patch('fetch_and_summarize.SESSION.get', side_effect=fake_get)
+    def test_unchanged_pdf_not_redownloaded(self, mock_get):
+        sources = {"wisdomtree": "https://example.com/wt.pdf"}
+        download_pdfs(sources)
+        with open("wisdomtree.pdf", "wb") as f:
+            f.write(b"local copy")
+        paths = download_pdfs(sources)
+        self.assertEqual(paths, {"wisdomtree": "wisdomtree.pdf"})
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"wt.pdf"'})
+        # 304: the local file is reused as-is
+        with open("wisdomtree.pdf", "rb") as f:
+            self.assertEqual(f.read(), b"local copy")
+
+if __name__ == '__main__':
+    unittest.main()
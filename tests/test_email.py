@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import send_email
+
+@patch('fetch_and_summarize.SMTP_EMAIL', 'bot@example.com')
+@patch('fetch_and_summarize.SMTP_PASSWORD', 'secret')
+class TestEmail(unittest.TestCase):
+
+    @patch('fetch_and_summarize.RECIPIENT_EMAIL', 'a@example.com, b@example.com')
+    @patch('fetch_and_summarize.smtplib.SMTP_SSL')
+    def test_one_connection_for_all_recipients(self, mock_smtp):
+        server = mock_smtp.return_value.__enter__.return_value
+        sent_to = []
+        server.send_message.side_effect = lambda msg: sent_to.append(msg['To'])
+
+        self.assertTrue(send_email("Subject", "Body", "https://example.github.io/repo/"))
+
+        mock_smtp.assert_called_once()
+        server.login.assert_called_once_with('bot@example.com', 'secret')
+        self.assertEqual(sent_to, ['a@example.com', 'b@example.com'])
+
+    @patch('fetch_and_summarize.RECIPIENT_EMAIL', None)
+    @patch('fetch_and_summarize.smtplib.SMTP_SSL')
+    def test_skipped_without_recipient(self, mock_smtp):
+        self.assertFalse(send_email("Subject", "Body", None))
+        mock_smtp.assert_not_called()
+
+    @patch('fetch_and_summarize.RECIPIENT_EMAIL', 'a@example.com')
+    @patch('fetch_and_summarize.smtplib.SMTP_SSL')
+    def test_failure_reported(self, mock_smtp):
+        mock_smtp.return_value.__enter__.return_value.login.side_effect = Exception("auth")
+        self.assertFalse(send_email("Subject", "Body", None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import upload_pdfs_gemini
+
+def fake_file(name, hours_left=47):
+    f = MagicMock()
+    f.name = name
+    f.state.name = "ACTIVE"
+    f.expiration_time = datetime.now(timezone.utc) + timedelta(hours=hours_left)
+    return f
+
+@patch('fetch_and_summarize.AI_STUDIO_API_KEY', 'test-key')
+class TestGeminiUploads(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_patch = patch('fetch_and_summarize.GEMINI_UPLOAD_INDEX', os.path.join(self.tmp.name, "uploads.json"))
+        self.index_patch.start()
+        self.genai = MagicMock()
+        self.genai_patch = patch('fetch_and_summarize.get_genai', return_value=self.genai)
+        self.genai_patch.start()
+        self.pdf = os.path.join(self.tmp.name, "wisdomtree.pdf")
+        with open(self.pdf, "wb") as f:
+            f.write(b"%PDF-1.4 dashboard")
+
+    def tearDown(self):
+        self.index_patch.stop()
+        self.genai_patch.stop()
+        self.tmp.cleanup()
+
+    def test_rerun_reuses_live_upload(self):
+        mock_upload, mock_get = self.genai.upload_file, self.genai.get_file
+        mock_upload.return_value = fake_file("files/abc")
+        mock_get.return_value = fake_file("files/abc")
+        first = upload_pdfs_gemini({"wisdomtree": self.pdf})
+        second = upload_pdfs_gemini({"wisdomtree": self.pdf})
+        self.assertEqual(mock_upload.call_count, 1)
+        mock_get.assert_called_once_with("files/abc")
+        self.assertEqual(second["wisdomtree"].name, first["wisdomtree"].name)
+
+    def test_expiring_upload_is_replaced(self):
+        mock_upload, mock_get = self.genai.upload_file, self.genai.get_file
+        mock_upload.side_effect = [fake_file("files/abc"), fake_file("files/def")]
+        mock_get.return_value = fake_file("files/abc", hours_left=0.5)
+        upload_pdfs_gemini({"wisdomtree": self.pdf})
+        second = upload_pdfs_gemini({"wisdomtree": self.pdf})
+        self.assertEqual(mock_upload.call_count, 2)
+        self.assertEqual(second["wisdomtree"].name, "files/def")
+
+    def test_changed_pdf_is_uploaded(self):
+        mock_upload, mock_get = self.genai.upload_file, self.genai.get_file
+        mock_upload.side_effect = [fake_file("files/abc"), fake_file("files/def")]
+        upload_pdfs_gemini({"wisdomtree": self.pdf})
+        with open(self.pdf, "wb") as f:
+            f.write(b"%PDF-1.4 tomorrow's dashboard")
+        upload_pdfs_gemini({"wisdomtree": self.pdf})
+        self.assertEqual(mock_upload.call_count, 2)
+        mock_get.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,13 +4,24 @@ import pandas as pd
 from datetime import datetime, timedelta
 import sys
 import os
+import tempfile
 
 # Add scripts to path so we can import
 sys.path.append(os.path.join(os.getcwd(), 'scripts'))
-from fetch_and_summarize import fetch_live_data
+from fetch_and_summarize import fetch_live_data, fetch_history
 
 class TestLiveData(unittest.TestCase):
 
+    def setUp(self):
+        # Keep each test's mocked history out of the shared on-disk cache
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir_patch = patch('fetch_and_summarize.LIVE_DATA_CACHE_DIR', self.tmp.name)
+        self.dir_patch.start()
+
+    def tearDown(self):
+        self.dir_patch.stop()
+        self.tmp.cleanup()
+
     @patch('yfinance.Ticker')
     def test_sp500_trend_logic_yesterday(self, mock_ticker):
         # Setup mock data: 60 trading days
@@ -129,5 +140,39 @@ class TestLiveData(unittest.TestCase):
         self.assertEqual(data['sp500_trend_status'], "Unknown")
         self.assertIn("Insufficient data", data['sp500_trend_audit'])
 
+    @patch('yfinance.Ticker')
+    @patch('fetch_and_summarize.datetime')
+    def test_tz_aware_index_keeps_exchange_dates(self, mock_datetime, mock_ticker):
+        # yfinance returns exchange-local midnight timestamps; dates must not shift via UTC
+        mock_datetime.now.return_value = datetime(2025, 12, 22, 12, 0, 0)
+        dates = pd.date_range(end="2025-12-19", periods=60, freq='B', tz="America/New_York")
+        mock_hist = pd.DataFrame({'Close': [100.0] * 60}, index=dates)
+
+        mock_instance = MagicMock()
+        mock_instance.history.return_value = mock_hist
+        mock_ticker.return_value = mock_instance
+
+        data = fetch_live_data()
+
+        self.assertEqual(data['sp500_current_date'], "2025-12-19")
+        self.assertIn("Change from 2025-11-20", data['sp500_trend_audit'])
+
+    @patch('yfinance.Ticker')
+    def test_history_cached_within_ttl(self, mock_ticker):
+        dates = pd.date_range(end=datetime.now(), periods=5, freq='B')
+        mock_instance = MagicMock()
+        mock_instance.history.return_value = pd.DataFrame({'Open': [0.0] * 5, 'Close': [1.0, 2.0, 3.0, 4.0, 5.0]}, index=dates)
+        mock_ticker.return_value = mock_instance
+
+        first = fetch_history("^TNX", "5d")
+        second = fetch_history("^TNX", "5d")
+
+        self.assertEqual(mock_instance.history.call_count, 1)
+        self.assertEqual(list(second['Close']), list(first['Close']))
+        self.assertEqual(list(second.columns), ['Close'])
+
+        fetch_history("^TNX", "1d") # different period is a different entry
+        self.assertEqual(mock_instance.history.call_count, 2)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import llm_cache_key, llm_cache_get, llm_cache_put, prune_cache, summarize_openrouter, extract_metrics_gemini
+
+def ok_response(text, finish_reason="stop"):
+    r = MagicMock()
+    r.status_code = 200
+    r.json.return_value = {"choices": [{"message": {"content": text}, "finish_reason": finish_reason}], "usage": {}}
+    return r
+
+class TestLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir_patch = patch('fetch_and_summarize.LLM_CACHE_DIR', self.tmp.name)
+        self.dir_patch.start()
+
+    def tearDown(self):
+        self.dir_patch.stop()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        key = llm_cache_key("openrouter", b"body")
+        self.assertIsNone(llm_cache_get(key))
+        llm_cache_put(key, "model", "# Summary")
+        self.assertEqual(llm_cache_get(key), "# Summary")
+        self.assertNotEqual(key, llm_cache_key("openrouter", b"other body"))
+
+    def test_expired_entry_is_ignored(self):
+        key = llm_cache_key("gemini", "prompt")
+        llm_cache_put(key, "model", "stale")
+        old = os.path.getmtime(os.path.join(self.tmp.name, f"{key}.json")) - 13 * 3600
+        os.utime(os.path.join(self.tmp.name, f"{key}.json"), (old, old))
+        self.assertIsNone(llm_cache_get(key))
+
+    def test_prune_removes_only_expired_entries(self):
+        live_dir = os.path.join(self.tmp.name, "yfinance")
+        os.makedirs(live_dir)
+        stale_key, fresh_key = llm_cache_key("stale"), llm_cache_key("fresh")
+        llm_cache_put(stale_key, "model", "old")
+        llm_cache_put(fresh_key, "model", "new")
+        paths = {
+            "stale_llm": os.path.join(self.tmp.name, f"{stale_key}.json"),
+            "state": os.path.join(self.tmp.name, "last_report.json"),
+            "stale_pkl": os.path.join(live_dir, "_VIX_1d_2025-01-01.pkl"),
+        }
+        for name in ("state", "stale_pkl"):
+            with open(paths[name], "wb") as f:
+                f.write(b"{}")
+        old = os.path.getmtime(paths["stale_llm"]) - 2 * 86400
+        for path in paths.values():
+            os.utime(path, (old, old))
+
+        with patch('fetch_and_summarize.LIVE_DATA_CACHE_DIR', live_dir), \
+             patch('fetch_and_summarize.GEMINI_UPLOAD_INDEX', os.path.join(self.tmp.name, "gemini_uploads.json")):
+            prune_cache()
+
+        self.assertFalse(os.path.exists(paths["stale_llm"]))
+        self.assertFalse(os.path.exists(paths["stale_pkl"]))
+        self.assertTrue(os.path.exists(paths["state"])) # run state is not a TTL entry
+        self.assertEqual(llm_cache_get(fresh_key), "new")
+
+    @patch('fetch_and_summarize.OPENROUTER_API_KEY', 'test-key')
+    @patch('fetch_and_summarize.SESSION.post')
+    def test_openrouter_rerun_hits_cache(self, mock_post):
+        mock_post.return_value = ok_response("fresh summary")
+        first = summarize_openrouter([], "Instructions", model_override="test/model")
+        second = summarize_openrouter([], "Instructions", model_override="test/model")
+        self.assertEqual(first, "fresh summary")
+        self.assertEqual(second, "fresh summary")
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch('fetch_and_summarize.OPENROUTER_API_KEY', 'test-key')
+    @patch('fetch_and_summarize.SESSION.post')
+    def test_errors_are_not_cached(self, mock_post):
+        error = MagicMock()
+        error.status_code = 400
+        error.text = "bad request"
+        mock_post.side_effect = [error, ok_response("recovered")]
+        self.assertTrue(summarize_openrouter([], "Instructions").startswith("Error 400"))
+        self.assertEqual(summarize_openrouter([], "Instructions"), "recovered")
+
+    @patch('fetch_and_summarize.OPENROUTER_API_KEY', 'test-key')
+    @patch('fetch_and_summarize.SESSION.post')
+    def test_incomplete_replies_are_not_cached(self, mock_post):
+        mock_post.side_effect = [ok_response("", "stop"), ok_response("# Cut", "length"), ok_response("# Full")]
+        self.assertEqual(summarize_openrouter([], "Instructions"), "")
+        self.assertEqual(summarize_openrouter([], "Instructions"), "# Cut")
+        self.assertEqual(summarize_openrouter([], "Instructions"), "# Full")
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch('fetch_and_summarize.AI_STUDIO_API_KEY', 'test-key')
+    @patch('fetch_and_summarize.get_genai')
+    def test_extraction_cached_by_pdf_hash(self, mock_get_genai):
+        model = mock_get_genai.return_value.GenerativeModel.return_value
+        model.generate_content.return_value = MagicMock(text='{"vix_index": 15.2}')
+        pdf = MagicMock(sha256_hash="abc123")
+
+        first = extract_metrics_gemini({"wisdomtree": pdf})
+        second = extract_metrics_gemini({"wisdomtree": pdf})
+        self.assertEqual(first, {"vix_index": 15.2})
+        self.assertEqual(second, first)
+        self.assertEqual(model.generate_content.call_count, 1)
+
+        # A different PDF (new hash) or prompt is a fresh extraction
+        extract_metrics_gemini({"wisdomtree": MagicMock(sha256_hash="def456")})
+        extract_metrics_gemini({"wisdomtree": pdf}, prompt_override="Other prompt")
+        self.assertEqual(model.generate_content.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
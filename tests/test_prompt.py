@@ -0,0 +1,29 @@
+import unittest
+import sys
+import os
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import build_summary_prompt, split_template
+from prompts import PROMPT_DATA_MARKER
+
+class TestSummaryPrompt(unittest.TestCase):
+
+    def test_static_prefix_is_data_independent(self):
+        a = build_summary_prompt({"extracted_metrics": {"vix": 14.2}}, {"flags": []})
+        b = build_summary_prompt({"extracted_metrics": {"vix": 31.7}}, {"flags": ["CPI"]})
+        self.assertEqual(a.partition(PROMPT_DATA_MARKER)[0], b.partition(PROMPT_DATA_MARKER)[0])
+        self.assertNotEqual(a, b)
+
+    def test_data_is_canonical(self):
+        a = build_summary_prompt({"b": 1, "a": {"y": 2, "x": 3}}, {"flags": []})
+        b = build_summary_prompt({"a": {"x": 3, "y": 2}, "b": 1}, {"flags": []})
+        self.assertEqual(a, b)
+        self.assertIn('{"a":{"x":3,"y":2},"b":1}', a)
+
+    def test_split_template_ignores_other_braces(self):
+        head, mid, tail = split_template('Schema: {"k": 1}\n{a} and {b}!', "a", "b")
+        self.assertEqual("".join([head, "X", mid, "Y", tail]), 'Schema: {"k": 1}\nX and Y!')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import render_pages, VISION_MAX_EDGE_PX
+
+class TestRender(unittest.TestCase):
+
+    def setUp(self):
+        import fitz
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.tmp.name, "deck.pdf")
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Page one")
+        doc.new_page() # blank divider
+        doc.new_page().draw_rect(fitz.Rect(50, 50, 200, 200)) # chart-like vector content, no text
+        doc.new_page().insert_text((72, 72), "Page four")
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_blank_pages_skipped(self):
+        images = render_pages(self.pdf_path, range(4))
+        self.assertEqual(len(images), 3)
+        for img in images:
+            self.assertTrue(img.startswith(b"\xff\xd8")) # JPEG magic
+
+    def test_page_range_respected(self):
+        images = render_pages(self.pdf_path, range(2, 4), grayscale=True)
+        self.assertEqual(len(images), 2)
+
+    def test_long_edge_capped(self):
+        import fitz
+        path = os.path.join(self.tmp.name, "tabloid.pdf")
+        doc = fitz.open()
+        doc.new_page(width=792, height=1224).insert_text((72, 72), "Tabloid") # 11x17in: 2448px tall at 2x
+        doc.new_page(width=612, height=792).insert_text((72, 72), "Letter")
+        doc.new_page(width=400, height=300).insert_text((72, 72), "Small")
+        doc.save(path)
+        doc.close()
+
+        big, letter, small = (fitz.Pixmap(img) for img in render_pages(path, range(3), zoom=2))
+        self.assertLessEqual(max(big.width, big.height), VISION_MAX_EDGE_PX)
+        self.assertGreater(max(big.width, big.height), VISION_MAX_EDGE_PX - 10)
+        # Under the cap: full zoom
+        self.assertEqual((letter.width, letter.height), (1224, 1584))
+        self.assertEqual((small.width, small.height), (800, 600))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import post_with_retry, backoff_delay
+
+def fake_response(status, headers=None):
+    r = MagicMock()
+    r.status_code = status
+    r.headers = headers or {}
+    return r
+
+class TestRetry(unittest.TestCase):
+
+    @patch('fetch_and_summarize.time.sleep')
+    @patch('fetch_and_summarize.SESSION.post')
+    def test_retry_after_honored(self, mock_post, mock_sleep):
+        mock_post.side_effect = [fake_response(429, {"Retry-After": "3"}), fake_response(200)]
+        response = post_with_retry("https://example.com")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_post.call_count, 2)
+        mock_sleep.assert_called_once_with(3.0)
+
+    @patch('fetch_and_summarize.time.sleep')
+    @patch('fetch_and_summarize.SESSION.post')
+    def test_non_retryable_returns_immediately(self, mock_post, mock_sleep):
+        mock_post.return_value = fake_response(400)
+        response = post_with_retry("https://example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(mock_post.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch('fetch_and_summarize.time.sleep')
+    @patch('fetch_and_summarize.SESSION.post')
+    def test_gives_up_after_max_attempts(self, mock_post, mock_sleep):
+        mock_post.return_value = fake_response(503)
+        response = post_with_retry("https://example.com")
+        # Final failing response is surfaced to the caller
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_sleep.call_count, mock_post.call_count - 1)
+
+    def test_backoff_is_capped(self):
+        for attempt in range(20):
+            self.assertLessEqual(backoff_delay(attempt), 60.0)
+        self.assertEqual(backoff_delay(0, retry_after="999"), 60.0)
+
+if __name__ == '__main__':
+    unittest.main()
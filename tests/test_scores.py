@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+
+# Add scripts to path so we can import
+sys.path.append(os.path.join(os.getcwd(), 'scripts'))
+from fetch_and_summarize import calculate_deterministic_scores, liquidity_score, credit_score
+
+class TestScores(unittest.TestCase):
+
+    def test_full_data(self):
+        data = {
+            "hy_spread_current": 4.5,
+            "real_yield_10y": 2.0,
+            "forward_pe_current": 22.0,
+            "inflation_expectations_5y5y": 2.35,
+            "yield_10y": 4.2,
+            "yield_2y": 3.9,
+            "vix_index": 16.0,
+        }
+        scores, details = calculate_deterministic_scores(data)
+        self.assertEqual(scores, {
+            "Liquidity Conditions": 4.0,
+            "Valuation Risk": 7.6,
+            "Inflation Pressure": 6.0,
+            "Credit Stress": 4.4,
+            "Growth Impulse": 4.3,
+            "Risk Appetite": 7.0,
+        })
+        self.assertEqual(details["Growth Impulse"], "Calculated (Curve 0.30%)")
+
+    def test_missing_data_defaults(self):
+        scores, details = calculate_deterministic_scores({})
+        self.assertEqual(scores["Liquidity Conditions"], 5.0)
+        self.assertEqual(scores["Risk Appetite"], 7.0)
+        self.assertEqual(details["Valuation Risk"], "Default (Missing P/E)")
+
+    def test_bad_value_defaults(self):
+        scores, details = calculate_deterministic_scores({"forward_pe_current": "n/a"})
+        self.assertEqual(scores["Valuation Risk"], 5.0)
+        self.assertEqual(details["Valuation Risk"], "Error (Defaulted)")
+
+    def test_formula_edges(self):
+        # Non-positive spreads are floored instead of failing the log
+        self.assertEqual(liquidity_score(0, 0.0), 10.0)
+        self.assertEqual(credit_score(2.0), 2.0)
+        self.assertEqual(credit_score(20.0), 10.0)
+
+if __name__ == '__main__':
+    unittest.main()